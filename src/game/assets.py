@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Asset manager for Kill the VC
+Loads images relative to the game's own directory instead of the working
+directory, converts them to the display's pixel format and keeps scaled and
+composited variants in the user cache so later launches skip decoding,
+scaling and compositing
+"""
+
+import hashlib
+import os
+import struct
+import threading
+
+import pygame
+
+from user_cache import get_cache_dir
+
+ASSET_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
+
+# Header of cached image files: width, height, bytes per pixel (3 for RGB, 4 for RGBA)
+CACHE_HEADER = struct.Struct("<III")
+
+
+class AssetError(Exception):
+    """An asset file is missing or could not be decoded"""
+
+
+def to_display_format(surface, alpha=True):
+    """Convert surface to the display's pixel format, if there is a display surface
+
+    Without one (the texture renderer draws to an SDL Renderer instead) the
+    surface is returned as is and converted when it is uploaded.
+    """
+    if pygame.display.get_surface() is None:
+        return surface
+    return surface.convert_alpha() if alpha else surface.convert()
+
+
+def surface_to_bytes(surface, pixel_format):
+    # pygame.image.tostring was renamed tobytes in pygame 2.1.3
+    to_bytes = getattr(pygame.image, "tobytes", None) or pygame.image.tostring
+    return to_bytes(surface, pixel_format)
+
+
+def surface_from_bytes(data, size, pixel_format):
+    from_bytes = getattr(pygame.image, "frombytes", None) or pygame.image.fromstring
+    return from_bytes(data, size, pixel_format)
+
+
+class AssetManager:
+    """Loads images from ASSET_DIR and caches derived variants on disk
+
+    Cached variants are stored as raw RGB or RGBA pixels, keyed by a name, the
+    parameters used to build them and the size and modification time of the
+    source files, so editing an asset or a build parameter rebuilds it.
+    Every surface returned is converted to the display format once
+    pygame.display.set_mode() has been called.
+    """
+
+    def __init__(self, asset_dir=ASSET_DIR, cache_dir=None):
+        self.asset_dir = asset_dir
+        self.cache_dir = cache_dir or get_cache_dir("images")
+
+        # Statistics
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def path(self, *parts):
+        """Absolute path of a file inside the asset directory"""
+        return os.path.join(self.asset_dir, *parts)
+
+    def load(self, name, alpha=True):
+        """Load an image file from the asset directory, unscaled"""
+        path = self.path(name)
+        try:
+            surface = pygame.image.load(path)
+        except (pygame.error, FileNotFoundError) as e:
+            raise AssetError(f"Could not load {path}: {e}")
+        return to_display_format(surface, alpha)
+
+    def load_scaled(self, name, size, alpha=True):
+        """Load an image file scaled to size, cached after the first launch"""
+        size = (int(size[0]), int(size[1]))
+        return self.derived(f"{name}@{size[0]}x{size[1]}", [name],
+                            lambda: pygame.transform.scale(self.load(name, alpha), size), alpha)
+
+    def derived(self, key, sources, build, alpha=True):
+        """Return the surface build() makes, from the disk cache if it is still valid
+
+        key names the variant and must change whenever what build() does
+        changes; sources are the asset files it reads.
+        """
+        cache_path = self._cache_path(key, sources)
+        surface = self._read_cache(cache_path)
+        if surface is not None:
+            self.cache_hits += 1
+        else:
+            self.cache_misses += 1
+            surface = build()
+            self._write_cache(cache_path, surface)
+        return to_display_format(surface, alpha)
+
+    def _cache_path(self, key, sources):
+        signature = [key]
+        for name in sources:
+            try:
+                stat = os.stat(self.path(name))
+            except OSError as e:
+                raise AssetError(f"Missing asset {self.path(name)}: {e}")
+            signature.append(f"{name}:{stat.st_size}:{stat.st_mtime_ns}")
+        digest = hashlib.sha1("|".join(signature).encode("utf-8")).hexdigest()[:16]
+        safe_key = "".join(c if c.isalnum() or c in "-_.@" else "_" for c in key)
+        return os.path.join(self.cache_dir, f"{safe_key}-{digest}.pixels")
+
+    def _read_cache(self, cache_path):
+        try:
+            with open(cache_path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        if len(data) < CACHE_HEADER.size:
+            return None
+        width, height, pixel_size = CACHE_HEADER.unpack_from(data)
+        pixels = data[CACHE_HEADER.size:]
+        if pixel_size not in (3, 4) or len(pixels) != width * height * pixel_size:
+            return None
+        return surface_from_bytes(pixels, (width, height), "RGBA" if pixel_size == 4 else "RGB")
+
+    def _write_cache(self, cache_path, surface):
+        # Write to a temporary file first so a crash never leaves a truncated cache entry
+        temp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        # Opaque surfaces are stored as RGB; their unused alpha byte is not guaranteed to be 255
+        has_alpha = surface.get_flags() & pygame.SRCALPHA
+        try:
+            with open(temp_path, "wb") as f:
+                f.write(CACHE_HEADER.pack(surface.get_width(), surface.get_height(), 4 if has_alpha else 3))
+                f.write(surface_to_bytes(surface, "RGBA" if has_alpha else "RGB"))
+            os.replace(temp_path, cache_path)
+        except OSError as e:
+            print(f"Could not cache asset {os.path.basename(cache_path)}: {e}")
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Camera mode negotiation for Kill the VC
+Probes which resolution, frame rate and pixel format a webcam actually
+delivers, picks the cheapest one that is good enough for hand tracking and
+remembers the choice per device so later launches can skip probing
+"""
+
+import json
+import os
+import sys
+import time
+
+import cv2
+
+from user_cache import get_cache_dir
+
+# What the hand tracker needs: full-frame searches run at 480 px wide anyway
+MIN_WIDTH = 480
+MIN_HEIGHT = 360
+MIN_FPS = 25
+
+# Candidate modes, cheapest first. For each resolution MJPG is tried before
+# YUYV because uncompressed YUYV is often limited to low frame rates over USB.
+CANDIDATE_MODES = [
+    (640, 480, 30, "MJPG"),
+    (640, 480, 30, "YUYV"),
+    (800, 600, 30, "MJPG"),
+    (1280, 720, 30, "MJPG"),
+    (1280, 720, 30, "YUYV"),
+]
+
+# Frames read before and during the frame rate measurement of each mode
+PROBE_WARMUP_FRAMES = 3
+PROBE_FRAMES = 10
+
+CACHE_FILE = "camera_modes.json"
+
+
+class CameraMode:
+    """A camera configuration and what it was measured to deliver"""
+
+    def __init__(self, width, height, fps, fourcc, measured_fps=None):
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.fourcc = fourcc
+        self.measured_fps = measured_fps
+
+    def to_dict(self):
+        return {"width": self.width, "height": self.height, "fps": self.fps,
+                "fourcc": self.fourcc, "measured_fps": self.measured_fps}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["width"], data["height"], data["fps"], data["fourcc"], data.get("measured_fps"))
+
+    def __repr__(self):
+        return f"{self.width}x{self.height} {self.fourcc} @ {self.fps} fps"
+
+
+def fourcc_to_string(value):
+    """Decode the float OpenCV returns for CAP_PROP_FOURCC"""
+    value = int(value)
+    return "".join(chr((value >> (8 * i)) & 0xFF) for i in range(4)).strip("\x00")
+
+
+def device_key(device):
+    """Cache key that changes when a different camera is plugged into the same index"""
+    name = ""
+    if sys.platform.startswith("linux"):
+        try:
+            with open(f"/sys/class/video4linux/video{device}/name") as f:
+                name = f.read().strip()
+        except OSError:
+            pass
+    return f"{device}:{name}" if name else str(device)
+
+
+def load_cache():
+    path = os.path.join(get_cache_dir(), CACHE_FILE)
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(cache):
+    path = os.path.join(get_cache_dir(), CACHE_FILE)
+    try:
+        with open(path, "w") as f:
+            json.dump(cache, f, indent=2)
+    except OSError as e:
+        print(f"Could not save camera mode cache: {e}")
+
+
+def apply_mode(video, mode):
+    """Ask the driver for mode; return True if it accepted the resolution"""
+    video.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*mode.fourcc))
+    video.set(cv2.CAP_PROP_FRAME_WIDTH, mode.width)
+    video.set(cv2.CAP_PROP_FRAME_HEIGHT, mode.height)
+    video.set(cv2.CAP_PROP_FPS, mode.fps)
+    return (int(video.get(cv2.CAP_PROP_FRAME_WIDTH)) == mode.width and
+            int(video.get(cv2.CAP_PROP_FRAME_HEIGHT)) == mode.height)
+
+
+def measure_fps(video):
+    """Read a few frames and return the frame rate actually delivered, or 0"""
+    for _ in range(PROBE_WARMUP_FRAMES):
+        if not video.read()[0]:
+            return 0.0
+    start_time = time.perf_counter()
+    for _ in range(PROBE_FRAMES):
+        if not video.read()[0]:
+            return 0.0
+    return PROBE_FRAMES / (time.perf_counter() - start_time)
+
+
+def probe_modes(video):
+    """Return the first (cheapest) candidate mode that delivers enough
+
+    If none reaches MIN_FPS, returns the one that delivered the most, or
+    None if no candidate delivered frames at all.
+    """
+    best = None
+    for width, height, fps, fourcc in CANDIDATE_MODES:
+        if width < MIN_WIDTH or height < MIN_HEIGHT:
+            continue
+        mode = CameraMode(width, height, fps, fourcc)
+        if not apply_mode(video, mode):
+            continue
+        # Some drivers accept any FOURCC and silently keep their own
+        mode.fourcc = fourcc_to_string(video.get(cv2.CAP_PROP_FOURCC)) or fourcc
+        mode.measured_fps = measure_fps(video)
+        print(f"Camera probe: {mode} delivered {mode.measured_fps:.1f} fps")
+        if mode.measured_fps >= MIN_FPS:
+            return mode
+        if mode.measured_fps > 0 and (best is None or mode.measured_fps > best.measured_fps):
+            best = mode
+    if best is not None:
+        print(f"No camera mode reached {MIN_FPS} fps, using the fastest: {best}")
+        apply_mode(video, best)
+    return best
+
+
+def configure_camera(video, device):
+    """Put an open cv2.VideoCapture into the best known mode for hand tracking
+
+    Uses the cached mode for this device when there is one and the driver
+    still accepts it, otherwise probes and caches the result. The result
+    is cached even when it is below MIN_FPS or is the driver defaults, so
+    each camera is probed only once. Returns the CameraMode in use, or None if the driver
+    defaults were kept.
+    """
+    key = device_key(device)
+    cache = load_cache()
+
+    cached = cache.get(key)
+    if cached == "defaults":
+        return None
+    if cached is not None:
+        mode = CameraMode.from_dict(cached)
+        if apply_mode(video, mode):
+            return mode
+        print(f"Cached camera mode {mode} no longer accepted, probing again")
+
+    defaults = CameraMode(int(video.get(cv2.CAP_PROP_FRAME_WIDTH)), int(video.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+                          video.get(cv2.CAP_PROP_FPS), fourcc_to_string(video.get(cv2.CAP_PROP_FOURCC)))
+    mode = probe_modes(video)
+    if mode is None:
+        print("No camera mode delivered frames, keeping driver defaults")
+        if len(defaults.fourcc) == 4:
+            apply_mode(video, defaults)
+        cache[key] = "defaults"
+        save_cache(cache)
+        return None
+
+    cache[key] = mode.to_dict()
+    save_cache(cache)
+    return mode
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Threaded camera capture for Kill the VC
+Reads frames from a frame source on a background thread into a single-slot
+buffer so the game loop can always grab the newest frame without waiting on
+the camera
+"""
+
+import threading
+import time
+
+from frame_sources import CameraSource
+
+# Give up on the camera after this many reads in a row fail
+MAX_CONSECUTIVE_FAILURES = 30
+
+# One buffer being written, one waiting as the latest frame, one held by the consumer
+NUM_FRAME_BUFFERS = 3
+
+
+class ThreadedCapture:
+    """Owns a frame source and keeps only the most recent frame"""
+
+    def __init__(self, source=0):
+        # Plain device numbers are accepted for convenience
+        if isinstance(source, int):
+            source = CameraSource(source)
+        self.source = source
+
+        self._lock = threading.Lock()
+        self._frame_ready = threading.Condition(self._lock)
+        self._thread = None
+        self._running = False
+        # Cleared while paused: the camera stays open but no frames are read
+        self._active = threading.Event()
+        self._active.set()
+
+        # Single-slot "latest frame" buffer. Frames are recycled through a small
+        # pool so steady-state capture decodes into existing arrays.
+        self._frame = None
+        self._frame_time = 0.0
+        self._in_use = None
+        self._free_buffers = []
+
+        # Statistics
+        self.frames_captured = 0
+        self.frames_dropped = 0
+        self.read_failures = 0
+        self.buffer_allocations = 0
+        self.delivered_fps = 0.0
+        self.failed = False
+
+    def start(self):
+        """Open the frame source and start the capture thread"""
+        if self._running:
+            return True
+
+        if not self.source.open():
+            print(f"Could not open frame source {self.source!r}")
+            self.source.release()
+            self.failed = True
+            return False
+
+        self.failed = False
+        self._running = True
+        self._thread = threading.Thread(target=self._capture_loop, name="camera-capture", daemon=True)
+        self._thread.start()
+        return True
+
+    def _capture_loop(self):
+        """Read frames as fast as the camera delivers them"""
+        consecutive_failures = 0
+
+        while self._running:
+            if not self._active.wait(0.1):
+                continue
+
+            with self._lock:
+                buffer = self._free_buffers.pop() if self._free_buffers else None
+            ret, frame = self.source.read(buffer)
+            capture_time = time.perf_counter()
+
+            if not ret:
+                with self._lock:
+                    self._recycle(buffer)
+                self.read_failures += 1
+                consecutive_failures += 1
+                if consecutive_failures >= MAX_CONSECUTIVE_FAILURES:
+                    print("Failed to grab frame from camera")
+                    self.source.release()
+                    with self._lock:
+                        self.failed = True
+                        self._running = False
+                        self._frame_ready.notify_all()
+                    break
+                time.sleep(0.01)
+                continue
+
+            consecutive_failures = 0
+            if frame is not buffer:
+                # First frames, or the frame size changed: the source allocated
+                self.buffer_allocations += 1
+
+            # Smoothed rate at which the source is really delivering frames
+            if self._frame_time:
+                interval = capture_time - self._frame_time
+                if 0 < interval < 1.0:
+                    if self.delivered_fps:
+                        self.delivered_fps += (1.0 / interval - self.delivered_fps) * 0.1
+                    else:
+                        self.delivered_fps = 1.0 / interval
+
+            with self._lock:
+                # The previous frame was never picked up by the consumer
+                if self._frame is not None:
+                    self.frames_dropped += 1
+                    self._recycle(self._frame)
+                self._frame = frame
+                self._frame_time = capture_time
+                self.frames_captured += 1
+                self._frame_ready.notify_all()
+
+    def _recycle(self, buffer):
+        """Return a frame buffer to the pool (caller holds the lock)"""
+        if buffer is not None and len(self._free_buffers) < NUM_FRAME_BUFFERS:
+            self._free_buffers.append(buffer)
+
+    def _take_frame(self):
+        """Hand the latest frame to the consumer, reclaiming the one it had before"""
+        self._recycle(self._in_use)
+        self._in_use = self._frame
+        self._frame = None
+        return self._in_use, self._frame_time
+
+    def wait_for_frame(self, timeout=None):
+        """Block until a new frame is available and return (frame, capture_time)
+
+        Returns (None, 0.0) on timeout or once the capture has stopped. The
+        returned frame stays valid until the next wait_for_frame() call.
+        """
+        with self._lock:
+            self._frame_ready.wait_for(lambda: self._frame is not None or not self._running, timeout)
+            if self._frame is None:
+                return None, 0.0
+            return self._take_frame()
+
+    def pause(self):
+        """Stop reading frames but keep the frame source open"""
+        self._active.clear()
+        with self._lock:
+            self._recycle(self._frame)
+            self._frame = None
+
+    def resume(self):
+        """Start reading frames again after pause()"""
+        self._active.set()
+
+    def is_running(self):
+        """Check if the capture thread is still delivering frames"""
+        return self._running
+
+    def get_stats(self):
+        """Return capture counters for debugging"""
+        with self._lock:
+            return {
+                "captured": self.frames_captured,
+                "dropped": self.frames_dropped,
+                "read_failures": self.read_failures,
+                "buffer_allocations": self.buffer_allocations,
+                "requested_fps": self.source.requested_fps,
+                "delivered_fps": self.delivered_fps,
+                "source_copies": self.source.copies,
+                "frame_age_ms": (time.perf_counter() - self._frame_time) * 1000 if self._frame_time else None,
+            }
+
+    def release(self):
+        """Stop the capture thread and release the frame source"""
+        with self._lock:
+            self._running = False
+            self._frame_ready.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        self.source.release()
+        with self._lock:
+            self._frame = None
+            self._in_use = None
+            self._free_buffers = []
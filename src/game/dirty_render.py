@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Dirty rectangle rendering for Kill the VC
+Gameplay objects become sprites in a LayeredDirty group, so each frame only
+the regions that changed are redrawn from the background and pushed to the
+display instead of the whole window
+"""
+
+import pygame
+
+# Draw order, back to front
+ENEMY_LAYER = 1
+SPACESHIP_LAYER = 2
+LASER_LAYER = 3
+FLASH_LAYER = 4
+PARTICLE_LAYER = 5
+HUD_LAYER = 6
+OVERLAY_LAYER = 7
+
+
+class SurfaceSprite(pygame.sprite.DirtySprite):
+    """Sprite showing a surface at a position, marked dirty only when either changes"""
+
+    def __init__(self, layer):
+        super().__init__()
+        self._layer = layer
+        self.image = pygame.Surface((1, 1), pygame.SRCALPHA)
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.visible = 0
+
+    def show(self, image, topleft):
+        topleft = (int(topleft[0]), int(topleft[1]))
+        if image is not self.image or topleft != self.rect.topleft:
+            self.image = image
+            self.rect = image.get_rect(topleft=topleft)
+            self.dirty = 1
+        if not self.visible:
+            self.visible = 1
+            self.dirty = 1
+
+    def hide(self):
+        if self.visible:
+            self.visible = 0
+            self.dirty = 1
+
+
+class CompositeSprite(SurfaceSprite):
+    """Transparent sprite redrawn by draw(surface) only when its inputs change"""
+
+    def __init__(self, layer, size, draw):
+        super().__init__(layer)
+        self._composite = pygame.Surface(size, pygame.SRCALPHA)
+        self._draw = draw
+        self._inputs = None
+
+    def refresh(self, inputs, topleft=(0, 0)):
+        if inputs != self._inputs:
+            self._composite.fill((0, 0, 0, 0))
+            self._draw(self._composite)
+            self._inputs = inputs
+            self.dirty = 1
+        self.show(self._composite, topleft)
+
+
+def with_ring(image, center, radius, color, width):
+    """Return (surface, offset) of image with a circle outline baked in
+
+    center is relative to the image's top left; offset is where the returned
+    surface's top left lies relative to it, since the ring may stick out.
+    """
+    left = min(0, center[0] - radius)
+    top = min(0, center[1] - radius)
+    right = max(image.get_width(), center[0] + radius + 1)
+    bottom = max(image.get_height(), center[1] + radius + 1)
+
+    surface = pygame.Surface((right - left, bottom - top), pygame.SRCALPHA)
+    surface.blit(image, (-left, -top))
+    pygame.draw.circle(surface, color, (center[0] - left, center[1] - top), radius, width)
+    return surface, (left, top)
+
+
+class GameplaySprites:
+    """The LayeredDirty group and sprites that draw the GAME state
+
+    The game logic keeps owning positions and state; each frame it calls
+    show()/hide() on the sprites it needs and draw() returns the rectangles
+    to pass to pygame.display.update().
+    """
+
+    def __init__(self, hud_size, draw_hud):
+        self.group = pygame.sprite.LayeredDirty()
+        self.spaceship = self._add(SurfaceSprite(SPACESHIP_LAYER))
+        self.particles = self._add(SurfaceSprite(PARTICLE_LAYER))
+        self.hud = self._add(CompositeSprite(HUD_LAYER, hud_size, draw_hud))
+        self.overlay = self._add(SurfaceSprite(OVERLAY_LAYER))
+        self.enemies = []
+        self.lasers = []
+        self._flashes = []
+        self._flash_frames = {}
+        self._flash_images = {}
+
+    def _add(self, sprite):
+        self.group.add(sprite, layer=sprite._layer)
+        return sprite
+
+    def start(self, screen, background):
+        """Use background for the next frames and repaint the whole window once"""
+        self.group.clear(screen, background)
+        self.repaint(screen)
+
+    def repaint(self, screen):
+        """Redraw everything on the next draw(), e.g. after the window was exposed"""
+        self.group.repaint_rect(screen.get_rect())
+
+    def _nth(self, sprites, index, layer):
+        while len(sprites) <= index:
+            sprites.append(self._add(SurfaceSprite(layer)))
+        return sprites[index]
+
+    def enemy(self, index):
+        """Return the sprite for enemy index, creating it on first use"""
+        return self._nth(self.enemies, index, ENEMY_LAYER)
+
+    def hide_enemies(self, start=0):
+        """Hide enemy sprites from start on, when there are fewer enemies than sprites"""
+        for sprite in self.enemies[start:]:
+            sprite.hide()
+
+    def laser(self, index):
+        """Return the sprite for the index-th laser shot drawn this frame, creating it on first use"""
+        return self._nth(self.lasers, index, LASER_LAYER)
+
+    def hide_lasers(self, start=0):
+        for sprite in self.lasers[start:]:
+            sprite.hide()
+
+    def flash(self, center, radius, color, frames=1):
+        """Show a filled circle for a number of frames, like a hit flash"""
+        key = (radius, color)
+        image = self._flash_images.get(key)
+        if image is None:
+            image = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(image, color, (radius, radius), radius)
+            self._flash_images[key] = image
+
+        sprite = next((flash for flash in self._flashes if not flash.visible), None)
+        if sprite is None:
+            sprite = self._add(SurfaceSprite(FLASH_LAYER))
+            self._flashes.append(sprite)
+        sprite.show(image, (center[0] - radius, center[1] - radius))
+        self._flash_frames[sprite] = frames
+
+    def draw(self, screen):
+        """Draw changed sprites and return the dirty rectangles"""
+        dirty_rects = self.group.draw(screen)
+
+        # Flashes disappear after their frames; hiding them repaints the background next frame
+        for sprite in self._flashes:
+            if sprite.visible:
+                self._flash_frames[sprite] -= 1
+                if self._flash_frames[sprite] <= 0:
+                    sprite.hide()
+        return dirty_rects
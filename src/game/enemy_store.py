@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Enemy store for Kill the VC
+Enemies are kept as parallel NumPy arrays, one element per enemy, so moving,
+bouncing and re-steering all of them is a few array operations per
+simulation step however many there are
+"""
+
+import numpy as np
+
+
+class EnemyStore:
+    """Positions, speeds and state of every enemy as struct-of-arrays
+
+    x, y are the top left corners of the enemies, each size pixels big, and
+    vx, vy their speeds in pixels per simulation step. They roam the area
+    from (0, 0) to bounds and bounce off its edges. Exactly one enemy has
+    is_vc set: the real VC.
+    """
+
+    def __init__(self, size, bounds, seed=None):
+        self.width, self.height = size
+        self.bounds = bounds
+        self._rng = np.random.default_rng(seed)
+        self.reset(0, (0, 0))
+
+    def reset(self, count, speed_range, spawn_top=50):
+        """Replace all enemies with count new ones at random positions and speeds"""
+        rng = self._rng
+        area_width, area_height = self.bounds
+        self.count = count
+        self.speed_range = speed_range
+
+        self.x = rng.integers(0, area_width - self.width, count).astype(np.float64)
+        self.y = rng.integers(spawn_top, area_height, count).astype(np.float64)
+        self.vx = np.empty(count)
+        self.vy = np.empty(count)
+        self._steer(np.arange(count))
+        self.rotation_speed = rng.uniform(-5, 5, count)
+        self.health = np.full(count, 100, np.int32)
+        self.is_vc = np.zeros(count, bool)
+        if count:
+            self.is_vc[rng.integers(count)] = True
+
+        # Positions before the last step, for drawing in between steps
+        self.previous_x = self.x.copy()
+        self.previous_y = self.y.copy()
+
+    def _steer(self, indices):
+        # Give enemies a new random heading within the level's speed range
+        low, high = self.speed_range
+        self.vx[indices] = self._rng.uniform(low, high, len(indices))
+        self.vy[indices] = self._rng.uniform(low / 2, high / 2, len(indices))
+
+    def step(self, redirect_chance=0.01):
+        """Move every enemy one simulation step, bounce them off the edges and re-steer a few"""
+        self.previous_x[:] = self.x
+        self.previous_y[:] = self.y
+        self.x += self.vx
+        self.y += self.vy
+
+        area_width, area_height = self.bounds
+        self.vx[(self.x <= 0) | (self.x >= area_width - self.width)] *= -1
+        self.vy[(self.y <= 0) | (self.y >= area_height - self.height)] *= -1
+
+        # Occasionally change direction
+        redirected = np.flatnonzero(self._rng.random(self.count) < redirect_chance)
+        if redirected.size:
+            self._steer(redirected)
+
+    def sweep_test(self, start_x, start_y, end_x, end_y):
+        """For each segment, the index of the enemy it hits first during the last step, or -1
+
+        A segment is the path a point travelled during the step that
+        step() just made. It is tested against each enemy's box as the box
+        moved over the same step, so fast shots can't pass through an enemy
+        between two steps. Ties go to the lowest enemy index.
+        """
+        start_x = np.asarray(start_x, np.float64)
+        start_y = np.asarray(start_y, np.float64)
+        end_x = np.asarray(end_x, np.float64)
+        end_y = np.asarray(end_y, np.float64)
+
+        # Broadphase: each path's bounding box against the box each enemy swept
+        # over the step, every shot against every enemy in one broadcast
+        path_left = np.minimum(start_x, end_x)[:, None]
+        path_top = np.minimum(start_y, end_y)[:, None]
+        path_right = np.maximum(start_x, end_x)[:, None]
+        path_bottom = np.maximum(start_y, end_y)[:, None]
+        near = ((path_right >= np.minimum(self.previous_x, self.x)) &
+                (path_left <= np.maximum(self.previous_x, self.x) + self.width) &
+                (path_bottom >= np.minimum(self.previous_y, self.y)) &
+                (path_top <= np.maximum(self.previous_y, self.y) + self.height))
+        pair_segments, pair_enemies = np.nonzero(near)
+
+        hits = np.full(len(start_x), -1, np.intp)
+        if not pair_enemies.size:
+            return hits
+
+        # Narrowphase: in the frame of the moving enemy the box stands still and
+        # the point moves in a straight line, so a segment-vs-box slab test finds
+        # the fraction of the step at which it enters the box
+        from_x = start_x[pair_segments] - self.previous_x[pair_enemies]
+        from_y = start_y[pair_segments] - self.previous_y[pair_enemies]
+        to_x = end_x[pair_segments] - self.x[pair_enemies]
+        to_y = end_y[pair_segments] - self.y[pair_enemies]
+        enter_x, exit_x = _slab(from_x, to_x - from_x, self.width)
+        enter_y, exit_y = _slab(from_y, to_y - from_y, self.height)
+        enter = np.maximum(np.maximum(enter_x, enter_y), 0.0)
+        leave = np.minimum(np.minimum(exit_x, exit_y), 1.0)
+        inside = enter <= leave
+        if not inside.any():
+            return hits
+
+        # Each segment hits the enemy it reaches first
+        segments = pair_segments[inside]
+        enemies = pair_enemies[inside]
+        order = np.lexsort((enemies, enter[inside], segments))
+        segments = segments[order]
+        first = np.flatnonzero(np.r_[True, segments[1:] != segments[:-1]])
+        hits[segments[first]] = enemies[order][first]
+        return hits
+
+    def center(self, index):
+        return (int(self.x[index] + self.width // 2), int(self.y[index] + self.height // 2))
+
+    def interpolated(self, alpha):
+        """Positions alpha of the way from the previous step to the current one"""
+        return (self.previous_x + (self.x - self.previous_x) * alpha,
+                self.previous_y + (self.y - self.previous_y) * alpha)
+
+    def __len__(self):
+        return self.count
+
+
+def _slab(start, delta, size):
+    # Fractions of the move start -> start + delta at which a point enters and
+    # leaves the span 0..size on one axis; (-inf, inf) or (inf, -inf) when it
+    # doesn't move along the axis and is inside or outside the span
+    with np.errstate(divide="ignore", invalid="ignore"):
+        first = -start / delta
+        second = (size - start) / delta
+    still = delta == 0
+    within = (start >= 0) & (start <= size)
+    enter = np.where(still, np.where(within, -np.inf, np.inf), np.minimum(first, second))
+    leave = np.where(still, np.where(within, np.inf, -np.inf), np.maximum(first, second))
+    return enter, leave
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Fixed timestep clock for Kill the VC
+Turns the real time between rendered frames into a whole number of
+simulation steps of equal length, so the game runs at the same speed
+whatever the frame rate, and reports how far into the next step rendering
+is so positions can be drawn in between
+"""
+
+
+def lerp(start, end, alpha):
+    """Value alpha of the way from start to end"""
+    return start + (end - start) * alpha
+
+
+class FixedTimestep:
+    """Accumulates elapsed time and hands it out in fixed steps
+
+    advance(now) returns how many steps to simulate this frame and alpha()
+    how far real time has got into the step after them. At most max_steps
+    are run per frame and time beyond that is dropped, so after a long stall
+    the game slows down briefly instead of spending several frames catching
+    up.
+    """
+
+    def __init__(self, step_hz=60, max_steps=5):
+        self.step_hz = step_hz
+        self.step = 1.0 / step_hz
+        self.max_steps = max_steps
+        self._accumulator = 0.0
+        self._last_time = None
+
+        # Statistics
+        self.last_steps = 0
+        self.total_steps = 0
+        self.dropped_time = 0.0
+
+    def reset(self):
+        """Start counting from the next advance(), e.g. when gameplay (re)starts"""
+        self._accumulator = 0.0
+        self._last_time = None
+
+    def advance(self, now):
+        """Add the time since the last call and return the number of steps to run"""
+        if self._last_time is not None:
+            self._accumulator += max(0.0, now - self._last_time)
+        self._last_time = now
+
+        steps = int(self._accumulator / self.step)
+        if steps > self.max_steps:
+            self.dropped_time += (steps - self.max_steps) * self.step
+            steps = self.max_steps
+            self._accumulator = self.step * steps
+        self._accumulator -= steps * self.step
+
+        self.last_steps = steps
+        self.total_steps += steps
+        return steps
+
+    def alpha(self):
+        """Fraction of a step between the last simulated state and now, from 0 to 1"""
+        return min(1.0, self._accumulator / self.step)
@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+Frame sources for Kill the VC
+Everything that can feed camera-like frames into the hand tracking pipeline:
+a live webcam, a recorded video or image sequence, or a synthetic moving hand
+"""
+
+import glob
+import math
+import os
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+from camera_config import configure_camera
+
+# Environment variable that selects the frame source at launch
+FRAME_SOURCE_ENV = "KILLTHEVC_SOURCE"
+
+
+class FrameSource:
+    """Base class for frame sources, mirroring the cv2.VideoCapture API we use"""
+
+    # Number of whole frames copied into caller buffers (rather than decoded into them)
+    copies = 0
+
+    # Frame rate the source was asked to deliver, if it has one
+    requested_fps = None
+
+    def open(self):
+        """Open the source, returning True on success"""
+        return True
+
+    def read(self, out=None):
+        """Return (ret, frame) with frame as a BGR uint8 image
+
+        When out is a preallocated array of the right shape the frame is
+        written into it and out itself is returned; otherwise a new array
+        may be allocated.
+        """
+        raise NotImplementedError
+
+    def release(self):
+        """Release any resources held by the source"""
+
+
+class RateLimiter:
+    """Sleeps so that successive tick() calls happen at most fps times a second"""
+
+    def __init__(self, fps):
+        self.interval = 1.0 / fps if fps else 0.0
+        self.next_time = None
+
+    def tick(self):
+        if not self.interval:
+            return
+        now = time.perf_counter()
+        if self.next_time is None:
+            self.next_time = now
+        elif now < self.next_time:
+            time.sleep(self.next_time - now)
+        else:
+            # Fell behind; don't try to catch up with a burst of frames
+            self.next_time = now
+        self.next_time += self.interval
+
+
+class CameraSource(FrameSource):
+    """A live webcam, switched to the best cached or probed mode when opened"""
+
+    def __init__(self, device=0, negotiate=True):
+        self.device = device
+        self.negotiate = negotiate
+        self.video = None
+        self.mode = None
+
+    def open(self):
+        self.video = cv2.VideoCapture(self.device)
+        if not self.video.isOpened():
+            return False
+        if self.negotiate:
+            self.mode = configure_camera(self.video, self.device)
+        if self.mode is not None:
+            self.requested_fps = self.mode.fps
+        return True
+
+    def read(self, out=None):
+        return self.video.read(out)
+
+    def release(self):
+        if self.video is not None:
+            self.video.release()
+            self.video = None
+
+    def __repr__(self):
+        return f"CameraSource({self.device})"
+
+
+class VideoFileSource(FrameSource):
+    """Plays back a recorded video file at a fixed rate, optionally looping"""
+
+    def __init__(self, path, fps=None, loop=True):
+        self.path = path
+        self.fps = fps
+        self.loop = loop
+        self.video = None
+        self._limiter = None
+
+    def open(self):
+        self.video = cv2.VideoCapture(self.path)
+        if not self.video.isOpened():
+            return False
+        # Default to the file's own frame rate; fps=0 means as fast as possible
+        fps = self.fps
+        if fps is None:
+            fps = self.video.get(cv2.CAP_PROP_FPS) or 30
+        self.requested_fps = fps or None
+        self._limiter = RateLimiter(fps)
+        return True
+
+    def read(self, out=None):
+        self._limiter.tick()
+        ret, frame = self.video.read(out)
+        if not ret and self.loop:
+            self.video.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.video.read(out)
+        return ret, frame
+
+    def release(self):
+        if self.video is not None:
+            self.video.release()
+            self.video = None
+
+    def __repr__(self):
+        return f"VideoFileSource({self.path!r})"
+
+
+class ImageSequenceSource(FrameSource):
+    """Plays back a directory or glob of still images at a fixed rate"""
+
+    def __init__(self, pattern, fps=30, loop=True):
+        self.pattern = pattern
+        self.fps = fps
+        self.loop = loop
+        self.paths = []
+        self.index = 0
+        self.requested_fps = fps or None
+        self._limiter = RateLimiter(fps)
+
+    def open(self):
+        pattern = self.pattern
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, "*")
+        extensions = (".png", ".jpg", ".jpeg", ".bmp")
+        self.paths = sorted(path for path in glob.glob(pattern) if path.lower().endswith(extensions))
+        self.index = 0
+        return bool(self.paths)
+
+    def read(self, out=None):
+        self._limiter.tick()
+        if self.index >= len(self.paths):
+            if not self.loop:
+                return False, None
+            self.index = 0
+        frame = cv2.imread(self.paths[self.index])
+        self.index += 1
+        if frame is None:
+            return False, None
+        # imread always decodes into a fresh array, so copy into the caller's buffer
+        if out is not None and out.shape == frame.shape:
+            np.copyto(out, frame)
+            self.copies += 1
+            return True, out
+        return True, frame
+
+    def __repr__(self):
+        return f"ImageSequenceSource({self.pattern!r})"
+
+
+# Synthetic hand outline in palm units: palm center at (0, 0), y pointing down and,
+# in camera (unmirrored) coordinates, the thumb on the right
+HAND_PALM = [(-1.0, -0.85), (1.0, -0.9), (1.1, 0.3), (0.75, 1.1), (-0.7, 1.1), (-1.05, 0.4)]
+HAND_WRIST = ((-0.55, 1.0), (0.55, 2.5))
+# (base x, length, width) from the little finger to the index finger
+HAND_FINGERS = [(-0.72, 1.3, 0.32), (-0.25, 1.65, 0.37), (0.25, 1.75, 0.38), (0.75, 1.5, 0.36)]
+HAND_FINGER_BASE_Y = -0.8
+HAND_FINGER_SPREAD = 1.15
+HAND_THUMB = [(0.85, 0.55), (1.45, 0.15), (1.9, -0.25)]
+HAND_THUMB_WIDTH = 0.45
+HAND_SKIN = (140, 170, 220)
+
+
+def hand_finger_tip(base_x, length):
+    """Center of a finger's rounded tip in palm units"""
+    return base_x * HAND_FINGER_SPREAD, HAND_FINGER_BASE_Y - length
+
+
+def render_hand(unit):
+    """Draw the synthetic hand with palm units of unit pixels
+
+    Returns (image, alpha, anchor): a BGR image, its float32 coverage of the
+    same height and width with a trailing axis for blending, and the pixel
+    of the palm center. A flat silhouette isn't recognized as a hand by
+    MediaPipe, so the fingers have joint creases, the palm has lines and
+    the edges are shaded and softened.
+    """
+    left, top = -1.3 * unit, -2.8 * unit
+    width, height = int(3.6 * unit), int(5.3 * unit)
+
+    def pixel(point):
+        return (int(point[0] * unit - left), int(point[1] * unit - top))
+
+    # Silhouette: palm, wrist, fingers and a two-part thumb
+    mask = np.zeros((height, width), np.uint8)
+    cv2.fillConvexPoly(mask, np.array([pixel(point) for point in HAND_PALM], np.int32), 255, cv2.LINE_AA)
+    cv2.rectangle(mask, pixel(HAND_WRIST[0]), pixel(HAND_WRIST[1]), 255, -1)
+    for base_x, length, finger_width in HAND_FINGERS:
+        tip = pixel(hand_finger_tip(base_x, length))
+        cv2.line(mask, pixel((base_x, HAND_FINGER_BASE_Y)), tip, 255, int(finger_width * unit), cv2.LINE_AA)
+        cv2.circle(mask, tip, int(finger_width * unit / 2), 255, -1, cv2.LINE_AA)
+    for start, end in zip(HAND_THUMB, HAND_THUMB[1:]):
+        cv2.line(mask, pixel(start), pixel(end), 255, int(HAND_THUMB_WIDTH * unit), cv2.LINE_AA)
+        cv2.circle(mask, pixel(end), int(HAND_THUMB_WIDTH * unit / 2), 255, -1, cv2.LINE_AA)
+
+    # Joint creases on each finger and the main palm lines
+    image = np.empty((height, width, 3), np.uint8)
+    image[:] = HAND_SKIN
+    crease = tuple(int(channel * 0.8) for channel in HAND_SKIN)
+    for base_x, length, finger_width in HAND_FINGERS:
+        tip_x, tip_y = hand_finger_tip(base_x, length)
+        for along in (0.45, 0.75):
+            x = base_x + (tip_x - base_x) * along
+            y = HAND_FINGER_BASE_Y + (tip_y - HAND_FINGER_BASE_Y) * along
+            half = finger_width * 0.3
+            cv2.line(image, pixel((x - half, y)), pixel((x + half, y)), crease, max(1, int(unit / 25)), cv2.LINE_AA)
+    line_width = max(1, int(unit / 20))
+    cv2.ellipse(image, pixel((0.0, -0.35)), (int(0.8 * unit), int(0.25 * unit)), 0, 200, 340, crease, line_width, cv2.LINE_AA)
+    cv2.ellipse(image, pixel((0.5, 0.5)), (int(0.6 * unit), int(0.6 * unit)), 0, 120, 250, crease, line_width, cv2.LINE_AA)
+
+    # Darker towards the edges, and soft edges
+    shade = cv2.GaussianBlur(mask, (0, 0), unit * 0.25).astype(np.float32) / 255
+    image = (image * (0.6 + 0.4 * shade[:, :, np.newaxis])).astype(np.uint8)
+    alpha = cv2.GaussianBlur(mask, (0, 0), max(1.0, unit / 30)).astype(np.float32)[:, :, np.newaxis] / 255
+    return image, alpha, (-left, -top)
+
+
+class SyntheticHandSource(FrameSource):
+    """Renders a drawn hand moving along a smooth, repeatable path
+
+    Frames are a pure function of the frame index, so runs are reproducible.
+    The hand is detailed enough for MediaPipe to track, and
+    fingertip_position() gives the ground truth index fingertip in the same
+    mirrored, normalized coordinates the hand tracker reports, and
+    frame_index_at() which frame a capture time belongs to.
+    """
+
+    def __init__(self, width=640, height=480, fps=30, period=4.0):
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.period = period
+        self.frame_index = 0
+        self.requested_fps = fps or None
+        self._limiter = RateLimiter(fps)
+        self._background = None
+        self._read_times = deque(maxlen=256)  # (time read() returned, frame index)
+
+        # Palm units in pixels; the hand is drawn once and moved around
+        self.unit = height * 0.075
+        self._hand = None
+
+    def open(self):
+        # Dim gradient so the hand isn't on a perfectly flat background
+        gradient = np.linspace(30, 90, self.width, dtype=np.uint8)
+        self._background = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        self._background[:] = gradient[np.newaxis, :, np.newaxis]
+        if self._hand is None:
+            self._hand = render_hand(self.unit)
+        self.frame_index = 0
+        self._read_times.clear()
+        return True
+
+    def _palm_center(self, frame_index):
+        """Palm center in camera (unmirrored) pixel coordinates"""
+        t = frame_index / (self.fps or 30) / self.period * 2 * math.pi
+        x = self.width * (0.5 + 0.3 * math.sin(t))
+        y = self.height * (0.55 + 0.2 * math.sin(2 * t))
+        return x, y
+
+    def fingertip_position(self, frame_index=None):
+        """Index fingertip as mirrored, normalized (x, y) for the given frame"""
+        if frame_index is None:
+            frame_index = self.frame_index - 1
+        x, y = self._palm_center(frame_index)
+        # The index finger is the one next to the thumb, see render_hand()
+        tip_x, tip_y = hand_finger_tip(*HAND_FINGERS[-1][:2])
+        # Drawing starts at the whole pixel below the palm center, see read()
+        x = int(x - self._hand[2][0]) + self._hand[2][0] + tip_x * self.unit
+        y = int(y - self._hand[2][1]) + self._hand[2][1] + tip_y * self.unit
+        return 1.0 - x / self.width, y / self.height
+
+    def frame_index_at(self, capture_time):
+        """Index of the frame captured at capture_time, or None if it is too old
+
+        Capture times are taken right after read() returns, so this is the
+        last frame finished at or before capture_time.
+        """
+        found = None
+        for read_time, frame_index in tuple(self._read_times):
+            if read_time > capture_time:
+                break
+            found = frame_index
+        return found
+
+    def read(self, out=None):
+        self._limiter.tick()
+        if out is not None and out.shape == self._background.shape:
+            np.copyto(out, self._background)
+            frame = out
+        else:
+            frame = self._background.copy()
+        self.copies += 1
+
+        # Blend the hand in with its palm center on the path, clipped to the frame
+        image, alpha, (anchor_x, anchor_y) = self._hand
+        x, y = self._palm_center(self.frame_index)
+        left, top = int(x - anchor_x), int(y - anchor_y)
+        height, width = alpha.shape[:2]
+        x0, y0 = max(0, left), max(0, top)
+        x1, y1 = min(self.width, left + width), min(self.height, top + height)
+        if x0 < x1 and y0 < y1:
+            region = frame[y0:y1, x0:x1]
+            cover = alpha[y0 - top:y1 - top, x0 - left:x1 - left]
+            hand = image[y0 - top:y1 - top, x0 - left:x1 - left]
+            region[:] = region + (hand - region.astype(np.float32)) * cover
+
+        self._read_times.append((time.perf_counter(), self.frame_index))
+        self.frame_index += 1
+        return True, frame
+
+    def __repr__(self):
+        return f"SyntheticHandSource({self.width}x{self.height}@{self.fps})"
+
+
+def open_frame_source(spec=None):
+    """Create a frame source from a spec string
+
+    "0", "1", ... select a webcam, "synthetic" the generated hand, a directory
+    or glob an image sequence, and anything else is treated as a video file.
+    Without a spec the KILLTHEVC_SOURCE environment variable is used, falling
+    back to webcam 0.
+    """
+    if spec is None:
+        spec = os.environ.get(FRAME_SOURCE_ENV, "0")
+    spec = str(spec)
+
+    if spec.isdigit():
+        return CameraSource(int(spec))
+    if spec == "synthetic":
+        return SyntheticHandSource()
+    if os.path.isdir(spec) or any(char in spec for char in "*?["):
+        return ImageSequenceSource(spec)
+    return VideoFileSource(spec)
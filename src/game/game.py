@@ -1,19 +1,68 @@
 import pygame
-import numpy as np
-import random
-import cv2
-import mediapipe as mp
 import sys
 import time
 import os
 
+import tracking_service
+from hand_features import INDEX_FINGER_TIP, PinchDetector
+from motion_filter import PointPredictor
+from rate_controller import InferenceRateController
+from sprite_cache import RotationCache
+from text_cache import TextCache
+from screen_cache import ScreenCache
+from dirty_render import GameplaySprites, with_ring
+from assets import AssetError, AssetManager, to_display_format
+from level_assets import LevelAssets
+from particles import ParticleSystem
+from fixed_timestep import FixedTimestep, lerp
+from enemy_store import EnemyStore
+from projectiles import ProjectilePool
+from render_backend import SurfaceCanvas, TextureCanvas, open_scaled_display, parse_size, set_scale_filter
+
 # Initialize Pygame
 pygame.init()
 
-# Set up the Pygame window
+# Set up the Pygame window. The game is always drawn at this logical resolution and scaled
+# to the window, so every coordinate below is in 800x600 space.
 window_width, window_height = 800, 600
-screen = pygame.display.set_mode((window_width, window_height))
-pygame.display.set_caption("Kill the VC - Hand Gesture Game")
+
+# Set KILLTHEVC_WINDOW_SIZE=1280x720 for a bigger window or KILLTHEVC_FULLSCREEN=1 to fill the
+# screen. KILLTHEVC_SCALE_FILTER picks how the frame is scaled: linear (smooth) or nearest (sharp).
+display_window_size = parse_size(os.environ.get("KILLTHEVC_WINDOW_SIZE", "800x600"))
+if display_window_size is None:
+    print(f"Invalid KILLTHEVC_WINDOW_SIZE {os.environ['KILLTHEVC_WINDOW_SIZE']!r}, expected e.g. 1280x720")
+    display_window_size = (window_width, window_height)
+display_fullscreen = os.environ.get("KILLTHEVC_FULLSCREEN", "") not in ("", "0")
+set_scale_filter(os.environ.get("KILLTHEVC_SCALE_FILTER", "linear"))
+
+# Set KILLTHEVC_PERFORMANCE=1 to render gameplay at the logical resolution and only scale the
+# finished frame, instead of drawing sprites at the full resolution of a large display
+performance_mode = os.environ.get("KILLTHEVC_PERFORMANCE", "") not in ("", "0")
+
+# Set KILLTHEVC_RENDERER=texture to draw gameplay with SDL's renderer and textures instead of
+# software blits. Add SDL_RENDER_DRIVER=software to use SDL's software renderer, e.g. without a GPU.
+render_backend = os.environ.get("KILLTHEVC_RENDERER", "surface")
+texture_canvas = None
+if render_backend == "texture":
+    try:
+        texture_canvas = TextureCanvas((window_width, window_height), "Kill the VC - Hand Gesture Game",
+                                       window_size=display_window_size, fullscreen=display_fullscreen,
+                                       render_to_texture=performance_mode)
+    except (RuntimeError, pygame.error) as e:
+        print(f"Texture renderer not available ({e}). Using the surface renderer.")
+        render_backend = "surface"
+
+if texture_canvas is not None:
+    # Menus and calibration are still drawn in software, then shown as one texture
+    screen = pygame.Surface((window_width, window_height))
+else:
+    # Software rendering always happens at the logical resolution; SDL scales it to the window
+    screen = open_scaled_display((window_width, window_height), display_window_size, display_fullscreen)
+    pygame.display.set_caption("Kill the VC - Hand Gesture Game")
+
+# Shown in the debug overlay
+display_description = f"{window_width}x{window_height} -> "
+display_description += "fullscreen" if display_fullscreen else f"{display_window_size[0]}x{display_window_size[1]}"
 
 # Initialize Pygame mixer
 pygame.mixer.init()
@@ -23,6 +72,13 @@ title_font = pygame.font.SysFont("Arial", 64, bold=True)
 menu_font = pygame.font.SysFont("Arial", 36)
 font = pygame.font.SysFont("Arial", 24)
 
+# Rendered text is cached so static strings are only rasterized once
+text_cache = TextCache()
+
+# Screens that only change on a key press are composited once and shown with a single blit
+static_screens = ScreenCache((window_width, window_height))
+presented_screen = None  # (name, inputs) of the static screen currently on the display
+
 # Game states
 MENU = 0
 GAME = 1
@@ -32,234 +88,199 @@ CALIBRATION = 4
 LEVEL_SELECT = 5
 VICTORY = 6
 
+# States drawn entirely from a pre-composited screen
+STATIC_STATES = (MENU, INSTRUCTIONS, LEVEL_SELECT, GAME_OVER, VICTORY)
+
 # Current game state
 game_state = MENU
 
+# Frame rate the game renders at, and the time each frame may take. Set KILLTHEVC_FPS to
+# render faster or slower; gameplay speed doesn't change with it.
+target_fps = 60
+try:
+    fps_setting = int(os.environ.get("KILLTHEVC_FPS", target_fps))
+    if fps_setting < 1:
+        raise ValueError
+    target_fps = fps_setting
+except ValueError:
+    print(f"Invalid KILLTHEVC_FPS {os.environ['KILLTHEVC_FPS']!r}, using {target_fps}")
+frame_budget_ms = 1000 / target_fps
+
+# Gameplay advances in fixed steps of this rate; every speed and cooldown below is per step.
+# After a stall at most max_steps are simulated in one frame.
+timestep = FixedTimestep(step_hz=60, max_steps=5)
+
+# Debug overlay with frame timing and hand tracking rate (toggle with F3)
+show_debug_overlay = False
+
+# Set KILLTHEVC_DIRTY_RECTS=1 to redraw and update only the parts of the window that changed
+# during gameplay. Helps most where the display is software rendered.
+dirty_rendering = render_backend == "surface" and os.environ.get("KILLTHEVC_DIRTY_RECTS", "") not in ("", "0")
+
 # Current level
 current_level = 1
 max_level = 3
 
-# Open the webcam when needed
-video = None
+# Images, sounds and music are found relative to this file, and scaled or tinted images are
+# cached in the user cache directory after the first launch
+assets = AssetManager()
 
-# Create assets directory if it doesn't exist
-os.makedirs("assets/Assets", exist_ok=True)
-os.makedirs("assets/sounds", exist_ok=True)
+# Sprite sizes
+spaceship_width, spaceship_height = 100, 100
+laser_width, laser_height = 20, 40
+vc_width, vc_height = 100, 100
 
-# Load background images for different levels
-try:
-    background_img = pygame.image.load("assets/Assets/gringotts.jpg")
-    background_img = pygame.transform.scale(background_img, (window_width, window_height))
-    
-    # Create fallback backgrounds for other levels if not found
-    try:
-        background_img_level2 = pygame.image.load("assets/Assets/level2_bg.jpg")
-        background_img_level2 = pygame.transform.scale(background_img_level2, (window_width, window_height))
-    except:
-        background_img_level2 = pygame.Surface((window_width, window_height))
-        background_img_level2.fill((0, 50, 50))  # Teal background for level 2
-        
-    try:
-        background_img_level3 = pygame.image.load("assets/Assets/level3_bg.jpg")
-        background_img_level3 = pygame.transform.scale(background_img_level3, (window_width, window_height))
-    except:
-        background_img_level3 = pygame.Surface((window_width, window_height))
-        background_img_level3.fill((50, 0, 50))  # Purple background for level 3
-except:
-    # Create fallback backgrounds if images not found
-    background_img = pygame.Surface((window_width, window_height))
-    background_img.fill((0, 0, 50))  # Dark blue background for level 1
-    
-    background_img_level2 = pygame.Surface((window_width, window_height))
-    background_img_level2.fill((0, 50, 50))  # Teal background for level 2
-    
-    background_img_level3 = pygame.Surface((window_width, window_height))
-    background_img_level3.fill((50, 0, 50))  # Purple background for level 3
+# Function to draw a glow behind a spaceship for the higher levels
+def add_glow(image, color):
+    glow = pygame.Surface((spaceship_width+20, spaceship_height+20), pygame.SRCALPHA)
+    pygame.draw.ellipse(glow, color, (0, 0, spaceship_width+20, spaceship_height+20))
+    glow.blit(image, (10, 10))
+    return glow
 
-# Dictionary to store level backgrounds
-level_backgrounds = {
-    1: background_img,
-    2: background_img_level2,
-    3: background_img_level3
-}
+# Function to tint a VC for the higher levels
+def add_tint(image, color):
+    tinted = image.copy()
+    tint = pygame.Surface(tinted.get_size(), pygame.SRCALPHA)
+    tint.fill(color)
+    tinted.blit(tint, (0, 0))
+    return tinted
 
-# Load spaceship image
-try:
-    spaceship_img = pygame.image.load("assets/Assets/spaceship1-removebg-preview.png").convert_alpha()
-    spaceship_width, spaceship_height = 100, 100
-    spaceship_img = pygame.transform.scale(spaceship_img, (spaceship_width, spaceship_height))
-    
-    # Create enhanced spaceships for higher levels
-    try:
-        spaceship_img_level2 = pygame.image.load("assets/Assets/spaceship2.png").convert_alpha()
-        spaceship_img_level2 = pygame.transform.scale(spaceship_img_level2, (spaceship_width, spaceship_height))
-    except:
-        # Create a level 2 spaceship with blue glow
-        spaceship_img_level2 = spaceship_img.copy()
-        glow = pygame.Surface((spaceship_width+20, spaceship_height+20), pygame.SRCALPHA)
-        pygame.draw.ellipse(glow, (0, 0, 255, 128), (0, 0, spaceship_width+20, spaceship_height+20))
-        glow.blit(spaceship_img, (10, 10))
-        spaceship_img_level2 = glow
-        
-    try:
-        spaceship_img_level3 = pygame.image.load("assets/Assets/spaceship3.png").convert_alpha()
-        spaceship_img_level3 = pygame.transform.scale(spaceship_img_level3, (spaceship_width, spaceship_height))
-    except:
-        # Create a level 3 spaceship with red glow
-        spaceship_img_level3 = spaceship_img.copy()
-        glow = pygame.Surface((spaceship_width+20, spaceship_height+20), pygame.SRCALPHA)
-        pygame.draw.ellipse(glow, (255, 0, 0, 128), (0, 0, spaceship_width+20, spaceship_height+20))
-        glow.blit(spaceship_img, (10, 10))
-        spaceship_img_level3 = glow
-except:
-    # Create a fallback spaceship if image not found
-    spaceship_img = pygame.Surface((100, 100), pygame.SRCALPHA)
-    pygame.draw.polygon(spaceship_img, (200, 200, 200), [(50, 0), (0, 100), (100, 100)])
-    
-    # Create fallback enhanced spaceships
-    spaceship_img_level2 = pygame.Surface((100, 100), pygame.SRCALPHA)
-    pygame.draw.polygon(spaceship_img_level2, (100, 200, 255), [(50, 0), (0, 100), (100, 100)])
-    
-    spaceship_img_level3 = pygame.Surface((100, 100), pygame.SRCALPHA)
-    pygame.draw.polygon(spaceship_img_level3, (255, 100, 100), [(50, 0), (0, 100), (100, 100)])
-
-# Dictionary to store level spaceships
-level_spaceships = {
-    1: spaceship_img,
-    2: spaceship_img_level2,
-    3: spaceship_img_level3
+# Per-level image files and what to draw instead when one is missing
+level_background_files = {
+    1: ("Assets/gringotts.jpg", (0, 0, 50)),  # Dark blue background if missing
+    2: ("Assets/level2_bg.jpg", (0, 50, 50)),  # Teal background if missing
+    3: ("Assets/level3_bg.jpg", (50, 0, 50))  # Purple background if missing
 }
+spaceship_file = "Assets/spaceship1-removebg-preview.png"
+level_spaceship_glows = {2: (0, 0, 255, 128), 3: (255, 0, 0, 128)}  # Blue and red glow
+level_spaceship_fallback_colors = {1: (200, 200, 200), 2: (100, 200, 255), 3: (255, 100, 100)}
+level_laser_sizes = {1: (laser_width, laser_height), 2: (laser_width, laser_height), 3: (laser_width*1.5, laser_height)}
+level_laser_fallback_colors = {1: (255, 0, 0), 2: (0, 100, 255), 3: (255, 50, 50)}
+vc_file = "Assets/Vc-removebg-preview.png"
+level_vc_scales = {1: 1.0, 2: 1.0, 3: 1.2}  # Level 3 VCs are larger
+level_vc_tints = {2: (0, 0, 255, 100), 3: (255, 0, 0, 100)}  # Blue and red tint
+level_vc_fallback_colors = {1: (150, 150, 150), 2: (100, 100, 200), 3: (200, 100, 100)}
+level_laser_volumes = {1: 0.3, 2: 0.4, 3: 0.5}
 
-# Load laser image
-try:
-    laser_img = pygame.image.load("assets/Assets/laser.png").convert_alpha()
-    laser_width, laser_height = 20, 40
-    laser_img = pygame.transform.scale(laser_img, (laser_width, laser_height))
-    
-    # Create enhanced lasers for higher levels
+# Functions to load one level's images
+def load_background(level):
+    background_file, fallback_color = level_background_files[level]
     try:
-        laser_img_level2 = pygame.image.load("assets/Assets/laser2.png").convert_alpha()
-        laser_img_level2 = pygame.transform.scale(laser_img_level2, (laser_width, laser_height))
-    except:
-        # Create a blue laser for level 2
-        laser_img_level2 = pygame.Surface((laser_width, laser_height), pygame.SRCALPHA)
-        pygame.draw.rect(laser_img_level2, (0, 100, 255), (0, 0, laser_width, laser_height))
-        
+        return assets.load_scaled(background_file, (window_width, window_height), alpha=False)
+    except AssetError:
+        background = to_display_format(pygame.Surface((window_width, window_height)), alpha=False)
+        background.fill(fallback_color)
+        return background
+
+def load_spaceship(level):
     try:
-        laser_img_level3 = pygame.image.load("assets/Assets/laser3.png").convert_alpha()
-        laser_img_level3 = pygame.transform.scale(laser_img_level3, (laser_width*1.5, laser_height))
-    except:
-        # Create a red laser for level 3
-        laser_img_level3 = pygame.Surface((laser_width*1.5, laser_height), pygame.SRCALPHA)
-        pygame.draw.rect(laser_img_level3, (255, 50, 50), (0, 0, laser_width*1.5, laser_height))
-except:
-    # Create fallback lasers if images not found
-    laser_img = pygame.Surface((20, 40), pygame.SRCALPHA)
-    pygame.draw.rect(laser_img, (255, 0, 0), (0, 0, 20, 40))
-    
-    laser_img_level2 = pygame.Surface((20, 40), pygame.SRCALPHA)
-    pygame.draw.rect(laser_img_level2, (0, 100, 255), (0, 0, 20, 40))
+        spaceship = assets.load_scaled(spaceship_file, (spaceship_width, spaceship_height))
+    except AssetError:
+        # Create a fallback spaceship if image not found
+        spaceship = pygame.Surface((100, 100), pygame.SRCALPHA)
+        pygame.draw.polygon(spaceship, level_spaceship_fallback_colors[level], [(50, 0), (0, 100), (100, 100)])
+        return spaceship
+    if level == 1:
+        return spaceship
     
-    laser_img_level3 = pygame.Surface((30, 40), pygame.SRCALPHA)
-    pygame.draw.rect(laser_img_level3, (255, 50, 50), (0, 0, 30, 40))
+    # Create enhanced spaceships for higher levels, with a glow if there is no image for the level
+    try:
+        return assets.load_scaled(f"Assets/spaceship{level}.png", (spaceship_width, spaceship_height))
+    except AssetError:
+        return assets.derived(f"spaceship-level{level}-glow", [spaceship_file],
+                              lambda: add_glow(spaceship, level_spaceship_glows[level]))
 
-# Dictionary to store level lasers
-level_lasers = {
-    1: laser_img,
-    2: laser_img_level2,
-    3: laser_img_level3
-}
+def load_laser(level):
+    laser_file = "Assets/laser.png" if level == 1 else f"Assets/laser{level}.png"
+    try:
+        return assets.load_scaled(laser_file, level_laser_sizes[level])
+    except AssetError:
+        laser = pygame.Surface(level_laser_sizes[level], pygame.SRCALPHA)
+        laser.fill(level_laser_fallback_colors[level])
+        return laser
 
-# Load VC image
-try:
-    vc_img = pygame.image.load("assets/Assets/Vc-removebg-preview.png").convert_alpha()
-    vc_width, vc_height = 100, 100
-    vc_img = pygame.transform.scale(vc_img, (vc_width, vc_height))
+def load_vc(level):
+    size = (int(vc_width*level_vc_scales[level]), int(vc_height*level_vc_scales[level]))
+    try:
+        vc = assets.load_scaled(vc_file, (vc_width, vc_height))
+    except AssetError:
+        # Create fallback VCs if images not found
+        vc = pygame.Surface(size, pygame.SRCALPHA)
+        pygame.draw.circle(vc, level_vc_fallback_colors[level], (size[0] // 2, size[1] // 2), size[0] // 2)
+        return vc
+    if level == 1:
+        return vc
     
-    # Create enhanced VCs for higher levels
+    # Create enhanced VCs for higher levels, tinted if there is no image for the level
     try:
-        vc_img_level2 = pygame.image.load("assets/Assets/vc2.png").convert_alpha()
-        vc_img_level2 = pygame.transform.scale(vc_img_level2, (vc_width, vc_height))
-    except:
-        # Create a level 2 VC with blue tint
-        vc_img_level2 = vc_img.copy()
-        blue_tint = pygame.Surface((vc_width, vc_height), pygame.SRCALPHA)
-        blue_tint.fill((0, 0, 255, 100))
-        vc_img_level2.blit(blue_tint, (0, 0))
-        
+        return assets.load_scaled(f"Assets/vc{level}.png", size)
+    except AssetError:
+        return assets.derived(f"vc-level{level}-tint-{size[0]}", [vc_file],
+                              lambda: add_tint(pygame.transform.scale(vc, size), level_vc_tints[level]))
+
+def load_laser_sound(level):
+    sound_file = "Assets/Laserpm.wav" if level == 1 else f"Assets/laser{level}.wav"
     try:
-        vc_img_level3 = pygame.image.load("assets/Assets/vc3.png").convert_alpha()
-        vc_img_level3 = pygame.transform.scale(vc_img_level3, (vc_width*1.2, vc_height*1.2))
+        sound = pygame.mixer.Sound(assets.path(sound_file))
+        sound.set_volume(level_laser_volumes[level])
+        return sound
     except:
-        # Create a level 3 VC with red tint and larger size
-        vc_img_level3 = pygame.transform.scale(vc_img, (int(vc_width*1.2), int(vc_height*1.2)))
-        red_tint = pygame.Surface((int(vc_width*1.2), int(vc_height*1.2)), pygame.SRCALPHA)
-        red_tint.fill((255, 0, 0, 100))
-        vc_img_level3.blit(red_tint, (0, 0))
-except:
-    # Create fallback VCs if images not found
-    vc_img = pygame.Surface((100, 100), pygame.SRCALPHA)
-    pygame.draw.circle(vc_img, (150, 150, 150), (50, 50), 50)
-    
-    vc_img_level2 = pygame.Surface((100, 100), pygame.SRCALPHA)
-    pygame.draw.circle(vc_img_level2, (100, 100, 200), (50, 50), 50)
-    
-    vc_img_level3 = pygame.Surface((120, 120), pygame.SRCALPHA)
-    pygame.draw.circle(vc_img_level3, (200, 100, 100), (60, 60), 60)
+        if level == 1:
+            return None
+        # Higher levels fall back to the level 1 sound
+        level_one = level_assets.peek(1)
+        return level_one["laser_sound"] if level_one is not None else load_laser_sound(1)
 
-# Dictionary to store level VCs
-level_vcs = {
-    1: vc_img,
-    2: vc_img_level2,
-    3: vc_img_level3
-}
+# Function to load everything one level needs; runs on a background thread when preloading
+def load_level(level):
+    vc = load_vc(level)
+    return {
+        "background": load_background(level),
+        "spaceship": load_spaceship(level),
+        "laser": load_laser(level),
+        "vc": vc,
+        # The real VC's sprite with its red indicator ring, for dirty rectangle rendering
+        "vc_ring": with_ring(vc, (vc_width // 2, vc_height // 2), vc_width // 2 + 5, (255, 0, 0), 2),
+        "laser_sound": load_laser_sound(level),
+    }
 
-# Load sound effects
+# Spinning enemies are drawn from pre-rotated frames (every 3 degrees) instead of rotating each frame
+enemy_rotation_cache = RotationCache(steps=120)
+
+# Function to drop derived data of a level that was evicted from memory
+def evict_level(level, bundle):
+    enemy_rotation_cache.discard(bundle["vc"])
+
+# Levels are loaded when first played and the next one while the level complete screen is shown.
+# Level 1 stays loaded because its background is also the menu background. A level's rotation
+# frames count towards its memory; about two levels fit in the budget, so the one played least
+# recently is dropped when a third level starts.
+level_assets = LevelAssets(load_level, memory_budget=24 * 1024 * 1024, pinned=(1,), on_evict=evict_level,
+                           derived_bytes=lambda bundle: enemy_rotation_cache.sprite_bytes(bundle["vc"]))
+level_backgrounds = level_assets.view("background")
+level_spaceships = level_assets.view("spaceship")
+level_lasers = level_assets.view("laser")
+level_vcs = level_assets.view("vc")
+level_vc_rings = level_assets.view("vc_ring")
+level_laser_sounds = level_assets.view("laser_sound")
+background_img = level_backgrounds[1]
+
+# Load sound effects shared by all levels
 try:
-    laser_sound = pygame.mixer.Sound("assets/Assets/Laserpm.wav")
-    laser_sound.set_volume(0.3)
-    
-    # Create enhanced sounds for higher levels
-    try:
-        laser_sound_level2 = pygame.mixer.Sound("assets/Assets/laser2.wav")
-        laser_sound_level2.set_volume(0.4)
-    except:
-        laser_sound_level2 = laser_sound
-        
-    try:
-        laser_sound_level3 = pygame.mixer.Sound("assets/Assets/laser3.wav")
-        laser_sound_level3.set_volume(0.5)
-    except:
-        laser_sound_level3 = laser_sound
-        
-    try:
-        victory_sound = pygame.mixer.Sound("assets/Assets/victory.wav")
-        victory_sound.set_volume(0.6)
-    except:
-        victory_sound = None
-        
-    try:
-        level_up_sound = pygame.mixer.Sound("assets/Assets/levelup.wav")
-        level_up_sound.set_volume(0.6)
-    except:
-        level_up_sound = None
+    victory_sound = pygame.mixer.Sound(assets.path("Assets/victory.wav"))
+    victory_sound.set_volume(0.6)
 except:
-    laser_sound = None
-    laser_sound_level2 = None
-    laser_sound_level3 = None
     victory_sound = None
+    
+try:
+    level_up_sound = pygame.mixer.Sound(assets.path("Assets/levelup.wav"))
+    level_up_sound.set_volume(0.6)
+except:
     level_up_sound = None
 
-# Dictionary to store level laser sounds
-level_laser_sounds = {
-    1: laser_sound,
-    2: laser_sound_level2,
-    3: laser_sound_level3
-}
-
 # Try to load background music
 try:
-    pygame.mixer.music.load("assets/sounds/Joh F.mp4")
+    pygame.mixer.music.load(assets.path("sounds/Joh F.mp4"))
     has_music = True
     
     # Try to load additional music for different levels
@@ -270,25 +291,25 @@ try:
     }
     
     try:
-        level2_music = "assets/sounds/level2_music.mp3"
+        level2_music = assets.path("sounds/level2_music.mp3")
         pygame.mixer.music.load(level2_music)
         has_level_music[2] = True
     except:
         pass
         
     try:
-        level3_music = "assets/sounds/level3_music.mp3"
+        level3_music = assets.path("sounds/level3_music.mp3")
         pygame.mixer.music.load(level3_music)
         has_level_music[3] = True
     except:
         pass
         
     # Reload default music
-    pygame.mixer.music.load("assets/sounds/Joh F.mp4")
+    pygame.mixer.music.load(assets.path("sounds/Joh F.mp4"))
 except:
     try:
         # Fallback to laser sound if main music not found
-        pygame.mixer.music.load("assets/Assets/Laserpm.wav")
+        pygame.mixer.music.load(assets.path("Assets/Laserpm.wav"))
         has_music = True
         has_level_music = {1: True, 2: False, 3: False}
     except:
@@ -298,9 +319,9 @@ except:
 
 # Level music paths
 level_music = {
-    1: "assets/sounds/Joh F.mp4",
-    2: "assets/sounds/level2_music.mp3",
-    3: "assets/sounds/level3_music.mp3"
+    1: assets.path("sounds/Joh F.mp4"),
+    2: assets.path("sounds/level2_music.mp3"),
+    3: assets.path("sounds/level3_music.mp3")
 }
 
 # Game variables
@@ -308,24 +329,26 @@ spaceship_x = window_width // 2 - spaceship_width // 2
 spaceship_y = window_height - spaceship_height
 spaceship_speed = 5
 
-laser_x, laser_y = None, None
-laser_speed = 10
-laser_state = "ready"
-laser_count = 0
+# Laser shots in flight, and simulation steps until the next shot can be fired
+lasers = ProjectilePool(capacity=64, bounds=(window_width, window_height))
 laser_cooldown = 0
 
-enemies = []
-num_enemies = 6
-vc_index = 0
+# Enemies roam the top half of the window; one of them is the real VC
+enemies = EnemyStore((vc_width, vc_height), (window_width, window_height // 2))
 vc_health = 100
 score = 0
 
+# Positions before the last simulation step; frames are drawn in between these and the current ones
+previous_spaceship = (spaceship_x, spaceship_y)
+
 # Level-specific variables
 level_settings = {
     1: {
         "num_enemies": 6,
         "enemy_speed_range": (-2, 2),
         "laser_speed": 10,
+        "fire_rate": 3,  # Shots per second
+        "laser_spread": (0,),  # Angle of each laser in a volley
         "vc_health": 100,
         "spaceship_speed": 5
     },
@@ -333,6 +356,8 @@ level_settings = {
         "num_enemies": 8,
         "enemy_speed_range": (-3, 3),
         "laser_speed": 12,
+        "fire_rate": 4,  # Shots per second
+        "laser_spread": (0,),  # Angle of each laser in a volley
         "vc_health": 150,
         "spaceship_speed": 6
     },
@@ -340,14 +365,24 @@ level_settings = {
         "num_enemies": 10,
         "enemy_speed_range": (-4, 4),
         "laser_speed": 15,
+        "fire_rate": 5,  # Shots per second
+        "laser_spread": (0,),  # Angle of each laser in a volley
         "vc_health": 200,
         "spaceship_speed": 7
     }
 }
 
 # Hand tracking variables
-hand_area_threshold = 500  # Default value
-mp_hands = None  # Initialize when needed
+hand_area_threshold = 500  # Minimum hand size, in 1/10000ths of the camera frame
+max_hand_result_age = 0.5  # Seconds before a tracking result counts as stale
+last_hand_result = None  # Last result fed into the fingertip filter
+finger_predictor = PointPredictor()  # Smooths and extrapolates the index fingertip
+pinch_detector = PinchDetector()  # Thumb-index pinch fires the laser
+rate_controller = InferenceRateController(frame_budget_ms)  # Tracks every 1st/2nd/3rd camera frame
+
+# Webcam and hand tracking shared by CALIBRATION and GAME (frames are read on background threads).
+# Set KILLTHEVC_SOURCE to play a video, an image folder or "synthetic" instead of the webcam.
+hand_tracking = tracking_service.TrackingService(rate_controller=rate_controller)
 
 # Health bar properties
 health_bar_width, health_bar_height = 200, 20
@@ -355,93 +390,138 @@ health_bar_x, health_bar_y = window_width // 2 - health_bar_width // 2, 10
 
 # Function to initialize enemies based on current level
 def initialize_enemies():
-    global enemies, vc_index, num_enemies
-    
     # Get level-specific settings
     level_config = level_settings[current_level]
-    num_enemies = level_config["num_enemies"]
-    enemy_speed_range = level_config["enemy_speed_range"]
-    
-    enemies = []
-    for _ in range(num_enemies):
-        enemy_x = np.random.randint(0, window_width - vc_width)
-        enemy_y = np.random.randint(50, window_height // 2)
-        enemy_speed_x = random.uniform(enemy_speed_range[0], enemy_speed_range[1])
-        enemy_speed_y = random.uniform(enemy_speed_range[0]/2, enemy_speed_range[1]/2)
-        enemy_rotation_speed = random.uniform(-5, 5)
-        enemy_health = 100
-        enemies.append((enemy_x, enemy_y, enemy_speed_x, enemy_speed_y, enemy_rotation_speed, enemy_health))
-    
-    # Randomly select the real VC
-    vc_index = random.randint(0, num_enemies - 1)
+    
+    # Spawn the level's enemies at random positions and randomly select the real VC
+    enemies.reset(level_config["num_enemies"], level_config["enemy_speed_range"])
 
 # Function to draw the health bar and score
-def draw_health_bar():
+def draw_health_bar(surface):
     # Get level-specific settings
     level_config = level_settings[current_level]
     max_health = level_config["vc_health"]
     
     health_width = max(0, int((vc_health / max_health) * health_bar_width))
-    pygame.draw.rect(screen, (255, 255, 255), (health_bar_x, health_bar_y, health_bar_width, health_bar_height))
-    pygame.draw.rect(screen, (0, 255, 0), (health_bar_x, health_bar_y, health_width, health_bar_height))
-    health_text = font.render(f"VC Health (Level {current_level})", True, (255, 255, 255))
-    screen.blit(health_text, (health_bar_x + health_bar_width // 2 - health_text.get_width() // 2, 
-                             health_bar_y + health_bar_height + 5))
+    surface.fill((255, 255, 255), (health_bar_x, health_bar_y, health_bar_width, health_bar_height))
+    surface.fill((0, 255, 0), (health_bar_x, health_bar_y, health_width, health_bar_height))
+    health_text = text_cache.render(font, f"VC Health (Level {current_level})", True, (255, 255, 255))
+    surface.blit(health_text, (health_bar_x + health_bar_width // 2 - health_text.get_width() // 2, 
+                              health_bar_y + health_bar_height + 5))
 
-def draw_score():
-    score_text = font.render("Score: " + str(score), True, (255, 255, 255))
-    screen.blit(score_text, (10, 10))
+def draw_score(surface):
+    score_text = text_cache.render(font, "Score: " + str(score), True, (255, 255, 255))
+    surface.blit(score_text, (10, 10))
     
     # Draw current level indicator
-    level_text = font.render(f"Level: {current_level}/{max_level}", True, (255, 255, 255))
-    screen.blit(level_text, (10, 40))
+    level_text = text_cache.render(font, f"Level: {current_level}/{max_level}", True, (255, 255, 255))
+    surface.blit(level_text, (10, 40))
+
+def draw_hud(surface):
+    draw_health_bar(surface)
+    draw_score(surface)
+
+# Function to check if a tracking result has a recent hand close enough to the camera
+def usable_hand(hand_result, now=None):
+    return (hand_result is not None and hand_result.landmarks is not None
+            and hand_result.age(now) <= max_hand_result_age
+            and hand_result.features.area >= hand_area_threshold)
+
+# Function to render the debug overlay
+def render_debug_overlay():
+    stats = rate_controller.get_stats()
+    lines = [f"FPS: {clock.get_fps():.0f}", f"Renderer: {render_backend}{' + dirty rects' if dirty_rendering else ''}"
+             f"{' (performance)' if performance_mode and texture_canvas is not None else ''}",
+             f"Display: {display_description}"]
+    if stats["frame_ms"] is not None:
+        lines.append(f"Frame: {stats['frame_ms']:.1f} / {stats['budget_ms']:.1f} ms")
+    lines.append(f"Simulation: {timestep.step_hz} Hz, {timestep.last_steps} steps")
+    if timestep.dropped_time > 0:
+        lines.append(f"Simulation time dropped: {timestep.dropped_time:.2f} s")
+    if stats["inference_ms"] is not None:
+        lines.append(f"Inference: {stats['inference_ms']:.1f} ms")
+    if stats["stride"] == 1:
+        lines.append("Tracking: every camera frame")
+    else:
+        lines.append(f"Tracking: every {stats['stride']} camera frames")
+    camera_stats = hand_tracking.capture.get_stats()
+    if camera_stats["requested_fps"]:
+        lines.append(f"Camera: {camera_stats['delivered_fps']:.1f} / {camera_stats['requested_fps']:.0f} fps")
+    else:
+        lines.append(f"Camera: {camera_stats['delivered_fps']:.1f} fps")
+    lines.append(f"Camera frames dropped: {camera_stats['dropped']}")
+    text_stats = text_cache.get_stats()
+    lines.append(f"Text cache: {text_stats['hit_rate']:.0%} hits, {text_stats['entries']} entries")
+    lines.append(f"Particles: {particles.live_count()} / {particles.capacity}")
+    lines.append(f"Lasers: {lasers.get_stats()['live']} / {lasers.capacity}")
+    
+    overlay = pygame.Surface((260, 10 + len(lines) * 24), pygame.SRCALPHA)
+    overlay.fill((0, 0, 0, 160))
+    for i, line in enumerate(lines):
+        overlay.blit(text_cache.render(font, line, True, (0, 255, 0)), (5, 5 + i * 24))
+    return overlay, (window_width - overlay.get_width() - 10, window_height - overlay.get_height() - 10)
+
+# Function to draw the debug overlay
+def draw_debug_overlay():
+    overlay, position = render_debug_overlay()
+    screen.blit(overlay, position)
+
+# Function to show a pre-composited static screen; returns False if the display already shows it
+def present_static_screen(name, draw_function, *inputs):
+    global presented_screen
+    
+    if presented_screen == (name, inputs):
+        return False
+    screen.blit(static_screens.get(name, inputs, draw_function), (0, 0))
+    presented_screen = (name, inputs)
+    return True
 
 # Function to draw menu
-def draw_menu():
-    screen.blit(background_img, (0, 0))
+def draw_menu(surface):
+    surface.blit(background_img, (0, 0))
     
     # Draw title
-    title_text = title_font.render("KILL THE VC", True, (255, 0, 0))
-    screen.blit(title_text, (window_width // 2 - title_text.get_width() // 2, 100))
+    title_text = text_cache.render(title_font, "KILL THE VC", True, (255, 0, 0))
+    surface.blit(title_text, (window_width // 2 - title_text.get_width() // 2, 100))
     
     # Draw subtitle
-    subtitle_text = menu_font.render("Hand Gesture Space Game", True, (255, 255, 255))
-    screen.blit(subtitle_text, (window_width // 2 - subtitle_text.get_width() // 2, 180))
+    subtitle_text = text_cache.render(menu_font, "Hand Gesture Space Game", True, (255, 255, 255))
+    surface.blit(subtitle_text, (window_width // 2 - subtitle_text.get_width() // 2, 180))
     
     # Draw menu options
-    play_text = menu_font.render("1. Play Game", True, (255, 255, 255))
-    screen.blit(play_text, (window_width // 2 - play_text.get_width() // 2, 260))
+    play_text = text_cache.render(menu_font, "1. Play Game", True, (255, 255, 255))
+    surface.blit(play_text, (window_width // 2 - play_text.get_width() // 2, 260))
     
-    level_select_text = menu_font.render("2. Level Select", True, (255, 255, 255))
-    screen.blit(level_select_text, (window_width // 2 - level_select_text.get_width() // 2, 300))
+    level_select_text = text_cache.render(menu_font, "2. Level Select", True, (255, 255, 255))
+    surface.blit(level_select_text, (window_width // 2 - level_select_text.get_width() // 2, 300))
     
-    instructions_text = menu_font.render("3. Instructions", True, (255, 255, 255))
-    screen.blit(instructions_text, (window_width // 2 - instructions_text.get_width() // 2, 340))
+    instructions_text = text_cache.render(menu_font, "3. Instructions", True, (255, 255, 255))
+    surface.blit(instructions_text, (window_width // 2 - instructions_text.get_width() // 2, 340))
     
-    calibration_text = menu_font.render("4. Calibrate Hand Tracking", True, (255, 255, 255))
-    screen.blit(calibration_text, (window_width // 2 - calibration_text.get_width() // 2, 380))
+    calibration_text = text_cache.render(menu_font, "4. Calibrate Hand Tracking", True, (255, 255, 255))
+    surface.blit(calibration_text, (window_width // 2 - calibration_text.get_width() // 2, 380))
     
-    quit_text = menu_font.render("5. Quit", True, (255, 255, 255))
-    screen.blit(quit_text, (window_width // 2 - quit_text.get_width() // 2, 420))
+    quit_text = text_cache.render(menu_font, "5. Quit", True, (255, 255, 255))
+    surface.blit(quit_text, (window_width // 2 - quit_text.get_width() // 2, 420))
     
     # Draw credits
-    credits_text = font.render("Created by iman, Blackboyzeus, Potus", True, (200, 200, 200))
-    screen.blit(credits_text, (window_width // 2 - credits_text.get_width() // 2, window_height - 40))
+    credits_text = text_cache.render(font, "Created by iman, Blackboyzeus, Potus", True, (200, 200, 200))
+    surface.blit(credits_text, (window_width // 2 - credits_text.get_width() // 2, window_height - 40))
 
 # Function to draw level select screen
-def draw_level_select():
-    screen.blit(background_img, (0, 0))
+def draw_level_select(surface):
+    surface.blit(background_img, (0, 0))
     
-    title_text = menu_font.render("SELECT LEVEL", True, (255, 255, 255))
-    screen.blit(title_text, (window_width // 2 - title_text.get_width() // 2, 100))
+    title_text = text_cache.render(menu_font, "SELECT LEVEL", True, (255, 255, 255))
+    surface.blit(title_text, (window_width // 2 - title_text.get_width() // 2, 100))
     
     # Draw level options
     for i in range(1, max_level + 1):
         if i <= max(1, current_level):  # Only show unlocked levels
-            level_text = menu_font.render(f"{i}. Level {i}", True, (255, 255, 255))
+            level_text = text_cache.render(menu_font, f"{i}. Level {i}", True, (255, 255, 255))
         else:
-            level_text = menu_font.render(f"{i}. Level {i} (Locked)", True, (150, 150, 150))
-        screen.blit(level_text, (window_width // 2 - level_text.get_width() // 2, 180 + (i-1) * 60))
+            level_text = text_cache.render(menu_font, f"{i}. Level {i} (Locked)", True, (150, 150, 150))
+        surface.blit(level_text, (window_width // 2 - level_text.get_width() // 2, 180 + (i-1) * 60))
     
     # Draw level descriptions
     level_descriptions = {
@@ -453,24 +533,24 @@ def draw_level_select():
     description_y = 350
     for i in range(1, max_level + 1):
         if i <= max(1, current_level):  # Only show descriptions for unlocked levels
-            desc_text = font.render(level_descriptions[i], True, (200, 200, 200))
-            screen.blit(desc_text, (window_width // 2 - desc_text.get_width() // 2, description_y))
+            desc_text = text_cache.render(font, level_descriptions[i], True, (200, 200, 200))
+            surface.blit(desc_text, (window_width // 2 - desc_text.get_width() // 2, description_y))
             description_y += 30
     
-    back_text = font.render("Press BACKSPACE to return to menu", True, (200, 200, 200))
-    screen.blit(back_text, (window_width // 2 - back_text.get_width() // 2, window_height - 40))
+    back_text = text_cache.render(font, "Press BACKSPACE to return to menu", True, (200, 200, 200))
+    surface.blit(back_text, (window_width // 2 - back_text.get_width() // 2, window_height - 40))
 
 # Function to draw instructions
-def draw_instructions():
-    screen.blit(background_img, (0, 0))
+def draw_instructions(surface):
+    surface.blit(background_img, (0, 0))
     
-    title_text = menu_font.render("HOW TO PLAY", True, (255, 255, 255))
-    screen.blit(title_text, (window_width // 2 - title_text.get_width() // 2, 50))
+    title_text = text_cache.render(menu_font, "HOW TO PLAY", True, (255, 255, 255))
+    surface.blit(title_text, (window_width // 2 - title_text.get_width() // 2, 50))
     
     instructions = [
         "1. Position your hand in front of your webcam",
         "2. Move your hand to control the spaceship",
-        "3. Press SPACEBAR to fire lasers",
+        "3. Pinch thumb and index finger (or press SPACEBAR) to fire",
         "4. Target the special VC enemy to win (marked with red circle)",
         "5. Avoid or destroy other enemies",
         "6. Reduce the VC's health to zero to advance to next level",
@@ -480,21 +560,19 @@ def draw_instructions():
     ]
     
     for i, line in enumerate(instructions):
-        line_text = font.render(line, True, (255, 255, 255))
-        screen.blit(line_text, (window_width // 2 - line_text.get_width() // 2, 120 + i * 40))
+        line_text = text_cache.render(font, line, True, (255, 255, 255))
+        surface.blit(line_text, (window_width // 2 - line_text.get_width() // 2, 120 + i * 40))
 
-# Function to draw calibration screen
-def draw_calibration():
-    global hand_area_threshold
+# Function to draw the parts of the calibration screen that only change with the threshold
+def draw_calibration_background(surface):
+    surface.blit(background_img, (0, 0))
     
-    screen.blit(background_img, (0, 0))
-    
-    title_text = menu_font.render("HAND TRACKING CALIBRATION", True, (255, 255, 255))
-    screen.blit(title_text, (window_width // 2 - title_text.get_width() // 2, 50))
+    title_text = text_cache.render(menu_font, "HAND TRACKING CALIBRATION", True, (255, 255, 255))
+    surface.blit(title_text, (window_width // 2 - title_text.get_width() // 2, 50))
     
     # Draw current threshold value
-    threshold_text = font.render(f"Current Threshold: {hand_area_threshold}", True, (255, 255, 255))
-    screen.blit(threshold_text, (window_width // 2 - threshold_text.get_width() // 2, 120))
+    threshold_text = text_cache.render(font, f"Current Threshold: {hand_area_threshold}", True, (255, 255, 255))
+    surface.blit(threshold_text, (window_width // 2 - threshold_text.get_width() // 2, 120))
     
     # Draw instructions
     instructions = [
@@ -502,57 +580,119 @@ def draw_calibration():
         "Higher value = Less sensitive",
         "Lower value = More sensitive",
         "",
-        "Move your hand to test the tracking",
+        "Move your hand to test the tracking, pinch to test firing",
         "Press ENTER to save and return to menu"
     ]
     
     for i, line in enumerate(instructions):
-        line_text = font.render(line, True, (255, 255, 255))
-        screen.blit(line_text, (window_width // 2 - line_text.get_width() // 2, 180 + i * 30))
-    
-    # If webcam is active, show hand tracking feedback
-    if video:
-        ret, frame = video.read()
-        if ret:
-            frame = cv2.flip(frame, 1)
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = mp_hands.process(rgb_frame)
+        line_text = text_cache.render(font, line, True, (255, 255, 255))
+        surface.blit(line_text, (window_width // 2 - line_text.get_width() // 2, 180 + i * 30))
+
+# Function to draw calibration screen
+def draw_calibration():
+    screen.blit(static_screens.get("calibration", (hand_area_threshold,), draw_calibration_background), (0, 0))
+    
+    # Show hand tracking feedback once the webcam and model are up
+    tracking_status = hand_tracking.status()
+    if tracking_status == tracking_service.STARTING:
+        feedback_text = text_cache.render(font, "Starting camera...", True, (255, 255, 255))
+        screen.blit(feedback_text, (window_width // 2 - feedback_text.get_width() // 2, 400))
+    elif tracking_status == tracking_service.UNAVAILABLE:
+        feedback_text = text_cache.render(font, "Camera not available. Check your webcam connection.", True, (255, 0, 0))
+        screen.blit(feedback_text, (window_width // 2 - feedback_text.get_width() // 2, 400))
+    else:
+        hand_result = hand_tracking.latest()
+        if (hand_result is not None and hand_result.landmarks is not None
+                and hand_result.age() <= max_hand_result_age):
+            index_finger_x = int(hand_result.landmarks[0, INDEX_FINGER_TIP, 0] * window_width)
+            index_finger_y = int(hand_result.landmarks[0, INDEX_FINGER_TIP, 1] * window_height)
+            features = hand_result.features
             
-            if results.multi_hand_landmarks:
-                hand_landmarks = results.multi_hand_landmarks[0]
-                index_finger_tip = hand_landmarks.landmark[mp.solutions.hands.HandLandmark.INDEX_FINGER_TIP]
-                index_finger_x = int(index_finger_tip.x * window_width)
-                index_finger_y = int(index_finger_tip.y * window_height)
-                
-                # Draw a circle to show tracking
-                pygame.draw.circle(screen, (255, 0, 0), (index_finger_x, index_finger_y), 10)
-                
-                # Show feedback text
-                feedback_text = font.render("Hand detected!", True, (0, 255, 0))
-                screen.blit(feedback_text, (window_width // 2 - feedback_text.get_width() // 2, 400))
+            # Draw a circle to show tracking (filled while pinching)
+            pinching = features.pinch_ratio < pinch_detector.pinch_threshold
+            pygame.draw.circle(screen, (255, 0, 0), (index_finger_x, index_finger_y), 10, 0 if pinching else 2)
+            
+            # Show feedback text
+            if features.area >= hand_area_threshold:
+                feedback_text = text_cache.render(font, "Hand detected!", True, (0, 255, 0))
             else:
-                feedback_text = font.render("No hand detected. Show your hand to the camera.", True, (255, 0, 0))
-                screen.blit(feedback_text, (window_width // 2 - feedback_text.get_width() // 2, 400))
+                feedback_text = text_cache.render(font, "Hand too far away. Move closer or lower the threshold.", True, (255, 255, 0))
+            screen.blit(feedback_text, (window_width // 2 - feedback_text.get_width() // 2, 400))
+            
+            hand_text = text_cache.render(font, f"Hand area: {features.area:.0f}   Fingers extended: {features.extended}"
+                                      f"   {'PINCH' if pinching else ''}", True, (255, 255, 255))
+            screen.blit(hand_text, (window_width // 2 - hand_text.get_width() // 2, 440))
+        else:
+            feedback_text = text_cache.render(font, "No hand detected. Show your hand to the camera.", True, (255, 0, 0))
+            screen.blit(feedback_text, (window_width // 2 - feedback_text.get_width() // 2, 400))
 
 # Function to draw victory screen
-def draw_victory():
-    screen.blit(background_img, (0, 0))
+def draw_victory(surface):
+    surface.blit(background_img, (0, 0))
+    
+    victory_title = text_cache.render(title_font, "TOTAL VICTORY!", True, (255, 215, 0))
+    surface.blit(victory_title, (window_width // 2 - victory_title.get_width() // 2, 100))
+    
+    victory_text = text_cache.render(menu_font, "You've defeated all VCs! Welcome to IPO", True, (255, 255, 255))
+    surface.blit(victory_text, (window_width // 2 - victory_text.get_width() // 2, 200))
     
-    victory_title = title_font.render("TOTAL VICTORY!", True, (255, 215, 0))
-    screen.blit(victory_title, (window_width // 2 - victory_title.get_width() // 2, 100))
+    score_text = text_cache.render(menu_font, f"Final Score: {score}", True, (255, 255, 255))
+    surface.blit(score_text, (window_width // 2 - score_text.get_width() // 2, 260))
     
-    victory_text = menu_font.render("You've defeated all VCs! Welcome to IPO", True, (255, 255, 255))
-    screen.blit(victory_text, (window_width // 2 - victory_text.get_width() // 2, 200))
+    continue_text = text_cache.render(font, "Press ENTER to return to menu or ESC to quit", True, (200, 200, 200))
+    surface.blit(continue_text, (window_width // 2 - continue_text.get_width() // 2, 350))
+
+# Function to draw the level complete screen
+def draw_level_complete(surface):
+    surface.blit(level_backgrounds[current_level], (0, 0))
     
-    score_text = menu_font.render(f"Final Score: {score}", True, (255, 255, 255))
-    screen.blit(score_text, (window_width // 2 - score_text.get_width() // 2, 260))
+    if current_level < max_level:
+        level_title = text_cache.render(title_font, f"LEVEL {current_level} COMPLETE!", True, (255, 215, 0))
+        surface.blit(level_title, (window_width // 2 - level_title.get_width() // 2, 100))
+        
+        next_level_text = text_cache.render(menu_font, f"Get ready for Level {current_level + 1}", True, (255, 255, 255))
+        surface.blit(next_level_text, (window_width // 2 - next_level_text.get_width() // 2, 200))
+        
+        score_text = text_cache.render(menu_font, f"Current Score: {score}", True, (255, 255, 255))
+        surface.blit(score_text, (window_width // 2 - score_text.get_width() // 2, 260))
+        
+        continue_text = text_cache.render(font, "Press ENTER to continue or ESC to return to menu", True, (200, 200, 200))
+        surface.blit(continue_text, (window_width // 2 - continue_text.get_width() // 2, 350))
+    else:
+        # Final level complete
+        victory_title = text_cache.render(title_font, "FINAL LEVEL COMPLETE!", True, (255, 215, 0))
+        surface.blit(victory_title, (window_width // 2 - victory_title.get_width() // 2, 100))
+        
+        victory_text = text_cache.render(menu_font, "You've defeated the final VC boss!", True, (255, 255, 255))
+        surface.blit(victory_text, (window_width // 2 - victory_text.get_width() // 2, 200))
+        
+        score_text = text_cache.render(menu_font, f"Score: {score}", True, (255, 255, 255))
+        surface.blit(score_text, (window_width // 2 - score_text.get_width() // 2, 260))
+        
+        continue_text = text_cache.render(font, "Press ENTER to see your victory or ESC to return to menu", True, (200, 200, 200))
+        surface.blit(continue_text, (window_width // 2 - continue_text.get_width() // 2, 350))
+
+# Function to fire a laser from the spaceship (SPACEBAR or pinch gesture)
+def fire_laser():
+    global laser_cooldown
     
-    continue_text = font.render("Press ENTER to return to menu or ESC to quit", True, (200, 200, 200))
-    screen.blit(continue_text, (window_width // 2 - continue_text.get_width() // 2, 350))
+    level_config = level_settings[current_level]
+    if laser_cooldown == 0:
+        if not lasers.fire(spaceship_x + spaceship_width // 2, spaceship_y,
+                           level_config["laser_speed"], level_config["laser_spread"]):
+            return
+        
+        # Play level-specific laser sound
+        if level_laser_sounds[current_level]:
+            level_laser_sounds[current_level].play()
+        
+        # The level's fire rate decides how many steps pass before the next shot
+        laser_cooldown = round(timestep.step_hz / level_config["fire_rate"])
 
 # Function to start the game
 def start_game(level=1):
-    global game_state, video, mp_hands, vc_health, score, laser_state, laser_cooldown, current_level
+    global game_state, vc_health, score, laser_cooldown, current_level
+    global previous_spaceship
     
     # Set the current level
     current_level = level
@@ -562,19 +702,29 @@ def start_game(level=1):
     vc_health = level_config["vc_health"]
     
     # Initialize game variables
-    laser_state = "ready"
+    lasers.clear()
     laser_cooldown = 0
     
-    # Initialize enemies
+    # Initialize enemies and render their rotation frames before the first GAME frame
     initialize_enemies()
+    particles.clear()
+    if texture_canvas is None:
+        enemy_rotation_cache.preload(level_vcs[current_level])
+    
+    # With the new level's frames built, drop levels not played recently if over budget
+    level_assets.evict()
+    
+    # Simulation time starts counting from the first GAME frame
+    timestep.reset()
+    previous_spaceship = (spaceship_x, spaceship_y)
     
-    # Initialize hand tracking if not already done
-    if mp_hands is None:
-        mp_hands = mp.solutions.hands.Hands(static_image_mode=False, max_num_hands=1, min_detection_confidence=0.5)
+    # Start steering from scratch; the tracking service resumes once the state is GAME
+    finger_predictor.reset()
+    pinch_detector.reset()
     
-    # Open webcam if not already open
-    if video is None:
-        video = cv2.VideoCapture(0)
+    # The first frame of the level repaints the whole window
+    if dirty_rendering:
+        gameplay_sprites.start(screen, level_backgrounds[current_level])
     
     # Start background music if available
     if has_music:
@@ -593,6 +743,81 @@ def start_game(level=1):
     # Change game state
     game_state = GAME
 
+# Function to advance gameplay by one fixed simulation step
+def update_game(predicted_finger, hit_flashes):
+    global spaceship_x, spaceship_y, laser_cooldown, vc_health, score
+    global previous_spaceship
+    
+    level_config = level_settings[current_level]
+    
+    # Remember where everything was so frames can be drawn in between steps
+    previous_spaceship = (spaceship_x, spaceship_y)
+    
+    # Steer towards the predicted fingertip
+    if predicted_finger is not None:
+        index_finger_x = int(predicted_finger[0])
+        index_finger_y = int(predicted_finger[1])
+        
+        # Move spaceship based on hand position
+        displacement_x = index_finger_x - (spaceship_x + spaceship_width // 2)
+        displacement_y = index_finger_y - (spaceship_y + spaceship_height // 2)
+        
+        sensitivity = 0.1
+        spaceship_x += int(displacement_x * sensitivity)
+        spaceship_y -= int(displacement_y * sensitivity)
+        
+        # Keep spaceship within bounds
+        spaceship_x = max(0, min(spaceship_x, window_width - spaceship_width))
+        spaceship_y = max(window_height // 2, min(spaceship_y, window_height - spaceship_height))
+    
+    # Move every laser shot in flight; shots leaving the screen this step can still hit on the way out
+    shots = lasers.live_indices()
+    lasers.step()
+    
+    # Move, bounce and re-steer all enemies at once
+    enemies.step()
+    
+    # Check the path every shot travelled this step against every moving enemy at once,
+    # so fast shots can't skip over an enemy; each shot hits at most one enemy
+    if shots.size:
+        hit_enemies = enemies.sweep_test(lasers.previous_x[shots], lasers.previous_y[shots],
+                                         lasers.x[shots], lasers.y[shots])
+        hits = hit_enemies >= 0
+        lasers.retire(shots[hits])
+        
+        for hit in hit_enemies[hits].tolist():
+            enemy_center = enemies.center(hit)
+            if enemies.is_vc[hit]:
+                # Hit the real VC
+                damage = 25 * current_level  # More damage in higher levels
+                vc_health -= damage
+                score += damage
+                hit_flashes.append((enemy_center, 50, (255, 255, 0)))
+                particles.emit(enemy_center, 200 * current_level, (255, 200, 40))
+            else:
+                # Hit regular enemy
+                score += 5 * current_level
+                hit_flashes.append((enemy_center, 30, (255, 255, 255)))
+                particles.emit(enemy_center, 80, (255, 255, 255), speed=(40, 160))
+    
+    particles.update(timestep.step)
+    
+    # Update laser cooldown
+    if laser_cooldown > 0:
+        laser_cooldown -= 1
+
+# Sprites for the dirty rectangle rendering path; the HUD sprite covers the health bar and score
+gameplay_sprites = GameplaySprites((window_width, 70), draw_hud)
+
+# Where gameplay is drawn when not using dirty rectangles
+gameplay_canvas = texture_canvas or SurfaceCanvas(screen, enemy_rotation_cache)
+
+# Sparks thrown off by laser hits; the oldest are reused once the pool is full
+particles = ParticleSystem(capacity=4096, bounds=(window_width, window_height))
+
+# Load the hand tracking model and open the webcam in the background while the menu is shown
+hand_tracking.warm_up()
+
 # Main game loop
 running = True
 clock = pygame.time.Clock()
@@ -603,8 +828,17 @@ while running:
         if event.type == pygame.QUIT:
             running = False
         
+        # The window contents may have been lost, so the next static screen is blitted again
+        if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED):
+            presented_screen = None
+            if dirty_rendering:
+                gameplay_sprites.repaint(screen)
+        
         # Handle key presses
         if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_F3:
+                show_debug_overlay = not show_debug_overlay
+            
             # Menu navigation
             if game_state == MENU:
                 if event.key == pygame.K_1:
@@ -614,11 +848,6 @@ while running:
                 elif event.key == pygame.K_3:
                     game_state = INSTRUCTIONS
                 elif event.key == pygame.K_4:
-                    # Initialize webcam and hand tracking for calibration
-                    if video is None:
-                        video = cv2.VideoCapture(0)
-                    if mp_hands is None:
-                        mp_hands = mp.solutions.hands.Hands(static_image_mode=False, max_num_hands=1, min_detection_confidence=0.5)
                     game_state = CALIBRATION
                 elif event.key == pygame.K_5 or event.key == pygame.K_ESCAPE:
                     running = False
@@ -650,17 +879,8 @@ while running:
             
             # Game controls
             elif game_state == GAME:
-                if event.key == pygame.K_SPACE and laser_cooldown == 0:
-                    if laser_state == "ready":
-                        laser_x = spaceship_x + spaceship_width // 2 - laser_width // 2
-                        laser_y = spaceship_y
-                        laser_state = "fire"
-                        
-                        # Play level-specific laser sound
-                        if level_laser_sounds[current_level]:
-                            level_laser_sounds[current_level].play()
-                            
-                        laser_cooldown = 20
+                if event.key == pygame.K_SPACE:
+                    fire_laser()
                 elif event.key == pygame.K_ESCAPE:
                     game_state = MENU
                     if has_music:
@@ -694,185 +914,180 @@ while running:
                 elif event.key == pygame.K_ESCAPE:
                     running = False
     
+    # Only keep the camera running in states that use hand tracking
+    hand_tracking.set_active(game_state in (GAME, CALIBRATION))
+    
     # Handle different game states
+    needs_display_update = True
+    display_update_rects = None  # Set when only parts of the window changed
+    drawn_on_canvas = False  # Set when gameplay was drawn through gameplay_canvas
     if game_state == MENU:
-        draw_menu()
+        needs_display_update = present_static_screen("menu", draw_menu)
     
     elif game_state == LEVEL_SELECT:
-        draw_level_select()
+        needs_display_update = present_static_screen("level_select", draw_level_select, max(1, current_level))
     
     elif game_state == INSTRUCTIONS:
-        draw_instructions()
+        needs_display_update = present_static_screen("instructions", draw_instructions)
     
     elif game_state == CALIBRATION:
         draw_calibration()
     
     elif game_state == GAME:
         # Game logic
-        ret, frame = video.read()
-        
-        if not ret:
-            print("Failed to grab frame from camera")
+        if hand_tracking.failed:
             game_state = MENU
             continue
         
-        frame = cv2.flip(frame, 1)
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        # Use whatever the tracking thread produced most recently
+        hand_result = hand_tracking.latest()
         
-        results = mp_hands.process(rgb_frame)
+        # Handle hand tracking, ignoring stale results and hands smaller than the calibrated threshold
+        now = time.perf_counter()
+        if usable_hand(hand_result, now):
+            # Feed each new result into the filter, stamped with its capture time
+            if hand_result is not last_hand_result:
+                index_finger_tip = hand_result.landmarks[0, INDEX_FINGER_TIP]
+                finger_predictor.update(index_finger_tip[0] * window_width,
+                                        index_finger_tip[1] * window_height,
+                                        hand_result.capture_time)
+                
+                # Pinch thumb and index finger to fire
+                if pinch_detector.update(hand_result.features.pinch_ratio):
+                    fire_laser()
+        else:
+            finger_predictor.reset()
+            pinch_detector.reset()
+        last_hand_result = hand_result
         
-        # Get level-specific settings
-        level_config = level_settings[current_level]
-        laser_speed = level_config["laser_speed"]
-        spaceship_speed = level_config["spaceship_speed"]
+        # Steer towards where the fingertip is predicted to be now, even between results
+        predicted_finger = finger_predictor.predict(now)
         
-        # Draw background for current level
-        screen.blit(level_backgrounds[current_level], (0, 0))
+        # Run as many fixed simulation steps as the time since the last frame covers
+        hit_flashes = []
+        for _ in range(timestep.advance(now)):
+            update_game(predicted_finger, hit_flashes)
+            if vc_health <= 0:
+                break
         
-        # Handle hand tracking
-        if results.multi_hand_landmarks:
-            hand_landmarks = results.multi_hand_landmarks[0]
-            index_finger_tip = hand_landmarks.landmark[mp.solutions.hands.HandLandmark.INDEX_FINGER_TIP]
-            index_finger_x = int(index_finger_tip.x * window_width)
-            index_finger_y = int(index_finger_tip.y * window_height)
+        # Draw everything between its previous and current simulated position, looking the
+        # level's images up once rather than for every sprite
+        level_images = level_assets.get(current_level)
+        alpha = timestep.alpha()
+        draw_spaceship_x = lerp(previous_spaceship[0], spaceship_x, alpha)
+        draw_spaceship_y = lerp(previous_spaceship[1], spaceship_y, alpha)
+        laser_image = level_images["laser"]
+        laser_xs, laser_ys = lasers.interpolated(lasers.live_indices(), alpha)
+        laser_draw_list = list(zip((laser_xs - laser_image.get_width() // 2).tolist(), laser_ys.tolist()))
+        enemy_xs, enemy_ys = enemies.interpolated(alpha)
+        
+        # Draw the frame
+        enemy_angles = (enemies.rotation_speed * (pygame.time.get_ticks() / 100)) % 360
+        enemy_draw_list = list(zip(enemy_xs.tolist(), enemy_ys.tolist(), enemy_angles.tolist(), enemies.is_vc.tolist()))
+        if dirty_rendering:
+            gameplay_sprites.spaceship.show(level_images["spaceship"], (draw_spaceship_x, draw_spaceship_y))
+            for i, laser_position in enumerate(laser_draw_list):
+                gameplay_sprites.laser(i).show(laser_image, laser_position)
+            gameplay_sprites.hide_lasers(len(laser_draw_list))
             
-            # Move spaceship based on hand position
-            displacement_x = index_finger_x - (spaceship_x + spaceship_width // 2)
-            displacement_y = index_finger_y - (spaceship_y + spaceship_height // 2)
+            for i, (enemy_x, enemy_y, enemy_angle, is_vc) in enumerate(enemy_draw_list):
+                if is_vc:
+                    # The main VC with its red indicator ring baked in
+                    vc_image, (offset_x, offset_y) = level_images["vc_ring"]
+                    gameplay_sprites.enemy(i).show(vc_image, (enemy_x + offset_x, enemy_y + offset_y))
+                else:
+                    rotated_enemy, half_width, half_height = enemy_rotation_cache.get(level_images["vc"], enemy_angle)
+                    gameplay_sprites.enemy(i).show(rotated_enemy, (int(enemy_x + vc_width // 2) - half_width,
+                                                                   int(enemy_y + vc_height // 2) - half_height))
+            gameplay_sprites.hide_enemies(len(enemies))
             
-            sensitivity = 0.1
-            spaceship_x += int(displacement_x * sensitivity)
-            spaceship_y -= int(displacement_y * sensitivity)
+            for center, radius, color in hit_flashes:
+                gameplay_sprites.flash(center, radius, color)
+            particle_layer = particles.render_layer()
+            if particle_layer is not None:
+                gameplay_sprites.particles.show(*particle_layer)
+            else:
+                gameplay_sprites.particles.hide()
+            gameplay_sprites.hud.refresh((current_level, vc_health, score))
             
-            # Keep spaceship within bounds
-            spaceship_x = max(0, min(spaceship_x, window_width - spaceship_width))
-            spaceship_y = max(window_height // 2, min(spaceship_y, window_height - spaceship_height))
-        
-        # Draw spaceship for current level
-        screen.blit(level_spaceships[current_level], (spaceship_x, spaceship_y))
-        
-        # Handle laser
-        if laser_state == "fire":
-            screen.blit(level_lasers[current_level], (laser_x, laser_y))
-            laser_y -= laser_speed
-            if laser_y <= 0:
-                laser_state = "ready"
-        
-        # Update and draw enemies
-        for i, enemy in enumerate(enemies):
-            enemy_x, enemy_y, enemy_speed_x, enemy_speed_y, enemy_rotation_speed, enemy_health = enemy
+            if show_debug_overlay:
+                gameplay_sprites.overlay.show(*render_debug_overlay())
+            else:
+                gameplay_sprites.overlay.hide()
+            display_update_rects = gameplay_sprites.draw(screen)
+        else:
+            gameplay_canvas.blit(level_images["background"], (0, 0))
             
-            # Move enemy
-            enemy_x += enemy_speed_x
-            enemy_y += enemy_speed_y
+            # Draw spaceship for current level
+            gameplay_canvas.blit(level_images["spaceship"], (draw_spaceship_x, draw_spaceship_y))
             
-            # Bounce off walls
-            if enemy_x <= 0 or enemy_x >= window_width - vc_width:
-                enemy_speed_x *= -1
-            if enemy_y <= 0 or enemy_y >= window_height // 2 - vc_height:
-                enemy_speed_y *= -1
+            for laser_position in laser_draw_list:
+                gameplay_canvas.blit(laser_image, laser_position)
             
-            # Occasionally change direction
-            if random.randint(1, 100) <= 1:
-                enemy_speed_x = random.uniform(level_config["enemy_speed_range"][0], level_config["enemy_speed_range"][1])
-                enemy_speed_y = random.uniform(level_config["enemy_speed_range"][0]/2, level_config["enemy_speed_range"][1]/2)
+            for enemy_x, enemy_y, enemy_angle, is_vc in enemy_draw_list:
+                if is_vc:
+                    # Draw the main VC for current level
+                    gameplay_canvas.blit(level_images["vc"], (enemy_x, enemy_y))
+                    # Draw a subtle indicator for the real VC
+                    gameplay_canvas.circle((255, 0, 0), 
+                                           (int(enemy_x + vc_width // 2), int(enemy_y + vc_height // 2)), 
+                                           int(vc_width // 2) + 5, 2)
+                else:
+                    # Regular enemies are rotated
+                    gameplay_canvas.blit_rotated(level_images["vc"], enemy_angle,
+                                                 (enemy_x + vc_width // 2, enemy_y + vc_height // 2))
             
-            # Draw enemy
-            if i == vc_index:
-                # Draw the main VC for current level
-                screen.blit(level_vcs[current_level], (enemy_x, enemy_y))
-                # Draw a subtle indicator for the real VC
-                pygame.draw.circle(screen, (255, 0, 0, 128), 
-                                  (int(enemy_x + vc_width // 2), int(enemy_y + vc_height // 2)), 
-                                  int(vc_width // 2) + 5, 2)
-            else:
-                # Regular enemies are rotated
-                rotated_enemy = pygame.transform.rotate(level_vcs[current_level], (enemy_rotation_speed * pygame.time.get_ticks() / 100) % 360)
-                rotated_rect = rotated_enemy.get_rect(center=(enemy_x + vc_width // 2, enemy_y + vc_height // 2))
-                screen.blit(rotated_enemy, rotated_rect.topleft)
+            # Visual feedback for hits
+            for center, radius, color in hit_flashes:
+                gameplay_canvas.circle(color, center, radius, 0)
+            gameplay_canvas.draw_particles(particles)
             
-            # Check for laser collision
-            if laser_state == "fire":
-                if (laser_x >= enemy_x and laser_x <= enemy_x + vc_width and 
-                    laser_y >= enemy_y and laser_y <= enemy_y + vc_height):
-                    # Hit!
-                    laser_state = "ready"
-                    
-                    if i == vc_index:
-                        # Hit the real VC
-                        damage = 25 * current_level  # More damage in higher levels
-                        vc_health -= damage
-                        score += damage
-                        # Visual feedback
-                        pygame.draw.circle(screen, (255, 255, 0), 
-                                          (int(enemy_x + vc_width // 2), int(enemy_y + vc_height // 2)), 
-                                          50, 0)
-                    else:
-                        # Hit regular enemy
-                        score += 5 * current_level
-                        # Visual feedback
-                        pygame.draw.circle(screen, (255, 255, 255), 
-                                          (int(enemy_x + vc_width // 2), int(enemy_y + vc_height // 2)), 
-                                          30, 0)
+            # Draw UI elements
+            draw_hud(gameplay_canvas)
             
-            # Update enemy
-            enemy = (enemy_x, enemy_y, enemy_speed_x, enemy_speed_y, enemy_rotation_speed, enemy_health)
-            enemies[i] = enemy
-        
-        # Draw UI elements
-        draw_health_bar()
-        draw_score()
+            if show_debug_overlay:
+                gameplay_canvas.blit_once(*render_debug_overlay())
+            drawn_on_canvas = True
         
         # Check for victory
         if vc_health <= 0:
             game_state = GAME_OVER
+            
+            # Load the next level in the background while the level complete screen is shown
+            if current_level < max_level:
+                level_assets.preload(current_level + 1)
             if has_music:
                 pygame.mixer.music.stop()
-        
-        # Update laser cooldown
-        if laser_cooldown > 0:
-            laser_cooldown -= 1
     
     elif game_state == GAME_OVER:
         # Draw level completion screen
-        screen.blit(level_backgrounds[current_level], (0, 0))
-        
-        if current_level < max_level:
-            level_title = title_font.render(f"LEVEL {current_level} COMPLETE!", True, (255, 215, 0))
-            screen.blit(level_title, (window_width // 2 - level_title.get_width() // 2, 100))
-            
-            next_level_text = menu_font.render(f"Get ready for Level {current_level + 1}", True, (255, 255, 255))
-            screen.blit(next_level_text, (window_width // 2 - next_level_text.get_width() // 2, 200))
-            
-            score_text = menu_font.render(f"Current Score: {score}", True, (255, 255, 255))
-            screen.blit(score_text, (window_width // 2 - score_text.get_width() // 2, 260))
-            
-            continue_text = font.render("Press ENTER to continue or ESC to return to menu", True, (200, 200, 200))
-            screen.blit(continue_text, (window_width // 2 - continue_text.get_width() // 2, 350))
-        else:
-            # Final level complete
-            victory_title = title_font.render("FINAL LEVEL COMPLETE!", True, (255, 215, 0))
-            screen.blit(victory_title, (window_width // 2 - victory_title.get_width() // 2, 100))
-            
-            victory_text = menu_font.render("You've defeated the final VC boss!", True, (255, 255, 255))
-            screen.blit(victory_text, (window_width // 2 - victory_text.get_width() // 2, 200))
-            
-            score_text = menu_font.render(f"Score: {score}", True, (255, 255, 255))
-            screen.blit(score_text, (window_width // 2 - score_text.get_width() // 2, 260))
-            
-            continue_text = font.render("Press ENTER to see your victory or ESC to return to menu", True, (200, 200, 200))
-            screen.blit(continue_text, (window_width // 2 - continue_text.get_width() // 2, 350))
+        needs_display_update = present_static_screen("level_complete", draw_level_complete, current_level, score)
     
     elif game_state == VICTORY:
         # Draw final victory screen
-        draw_victory()
+        needs_display_update = present_static_screen("victory", draw_victory, score)
+    
+    if show_debug_overlay and game_state == CALIBRATION:
+        draw_debug_overlay()
+    
+    # Update display, unless a static screen is already showing unchanged
+    if texture_canvas is not None:
+        if drawn_on_canvas:
+            texture_canvas.present()
+        elif needs_display_update:
+            texture_canvas.present_surface(screen)
+    elif display_update_rects is not None:
+        pygame.display.update(display_update_rects)
+    elif needs_display_update:
+        pygame.display.update()
+    if game_state not in STATIC_STATES:
+        presented_screen = None
+    clock.tick(target_fps)
     
-    # Update display
-    pygame.display.update()
-    clock.tick(60)
+    # Let the tracking rate follow how long this frame actually took to produce
+    rate_controller.record_frame(clock.get_rawtime())
 
 # Clean up
-if video:
-    video.release()
+hand_tracking.shutdown()
 pygame.quit()
 sys.exit()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Hand features for Kill the VC
+Turns MediaPipe hand landmarks into a NumPy array once per result and
+derives gesture features from it with vectorized math
+"""
+
+import numpy as np
+
+# MediaPipe hand landmark indices
+WRIST = 0
+THUMB_TIP = 4
+INDEX_FINGER_TIP = 8
+MIDDLE_FINGER_MCP = 9
+FINGER_PIPS = [6, 10, 14, 18]
+FINGER_TIPS = [8, 12, 16, 20]
+
+# A fingertip this much further from the wrist than its middle joint counts as extended
+EXTENDED_RATIO = 1.15
+
+
+def landmarks_to_array(multi_hand_landmarks):
+    """Convert MediaPipe's multi_hand_landmarks into a (num_hands, 21, 3) float32 array"""
+    return np.array([[(landmark.x, landmark.y, landmark.z) for landmark in hand.landmark]
+                     for hand in multi_hand_landmarks], dtype=np.float32)
+
+
+def hand_bounds(hand):
+    """Return (min_x, min_y, max_x, max_y) of a (21, 3) hand array"""
+    min_x, min_y = hand[:, :2].min(axis=0)
+    max_x, max_y = hand[:, :2].max(axis=0)
+    return float(min_x), float(min_y), float(max_x), float(max_y)
+
+
+class HandFeatures:
+    """Gesture features of one hand
+
+    pinch_ratio     thumb-to-index tip distance relative to hand size (palm length)
+    extended        number of extended fingers, thumb not counted
+    is_open         at least three fingers extended
+    is_closed       at most one finger extended
+    area            bounding box area in 1/10000ths of the camera frame, the
+                    unit hand_area_threshold is calibrated in
+    """
+
+    def __init__(self, pinch_ratio, extended, area):
+        self.pinch_ratio = pinch_ratio
+        self.extended = extended
+        self.is_open = extended >= 3
+        self.is_closed = extended <= 1
+        self.area = area
+
+
+def compute_hand_features(hand, aspect=4 / 3):
+    """Compute HandFeatures for a (21, 3) normalized hand array
+
+    aspect is the camera frame's width / height, so distances are measured in
+    the same units horizontally and vertically.
+    """
+    points = hand[:, :2] * np.array([aspect, 1.0], dtype=np.float32)
+
+    hand_size = np.linalg.norm(points[MIDDLE_FINGER_MCP] - points[WRIST])
+    pinch_distance = np.linalg.norm(points[THUMB_TIP] - points[INDEX_FINGER_TIP])
+    pinch_ratio = float(pinch_distance / hand_size) if hand_size > 0 else 1.0
+
+    tip_distances = np.linalg.norm(points[FINGER_TIPS] - points[WRIST], axis=1)
+    pip_distances = np.linalg.norm(points[FINGER_PIPS] - points[WRIST], axis=1)
+    extended = int(np.count_nonzero(tip_distances > pip_distances * EXTENDED_RATIO))
+
+    min_x, min_y, max_x, max_y = hand_bounds(hand)
+    area = (max_x - min_x) * (max_y - min_y) * 10000
+
+    return HandFeatures(pinch_ratio, extended, area)
+
+
+class PinchDetector:
+    """Debounced pinch gesture that fires once per pinch
+
+    A pinch starts when pinch_ratio is below pinch_threshold for hold_samples
+    tracking results in a row and only re-arms after it rises above
+    release_threshold, so landmark jitter around a single threshold can't
+    fire repeatedly. Counting results rather than seconds keeps the debounce
+    the same at any tracking rate; the latency is hold_samples - 1 tracking
+    intervals, about 33 ms at 30 fps.
+    """
+
+    def __init__(self, pinch_threshold=0.3, release_threshold=0.45, hold_samples=2):
+        self.pinch_threshold = pinch_threshold
+        self.release_threshold = release_threshold
+        self.hold_samples = hold_samples
+        self.reset()
+
+    def reset(self):
+        self.pinched = False
+        self._pinch_samples = 0
+
+    def update(self, pinch_ratio):
+        """Feed one tracking result's pinch_ratio; return True when a new pinch is recognized"""
+        if self.pinched:
+            if pinch_ratio > self.release_threshold:
+                self.reset()
+            return False
+
+        if pinch_ratio >= self.pinch_threshold:
+            self._pinch_samples = 0
+            return False
+
+        self._pinch_samples += 1
+        if self._pinch_samples >= self.hold_samples:
+            self.pinched = True
+            return True
+        return False
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Asynchronous hand tracking for Kill the VC
+Runs MediaPipe hand landmark inference on a worker thread and publishes the
+newest timestamped result so rendering never waits on the model
+"""
+
+import threading
+import time
+
+import cv2
+import mediapipe as mp
+import numpy as np
+
+from hand_features import compute_hand_features, hand_bounds, landmarks_to_array
+
+
+class TrackingResult:
+    """Hand landmarks for one camera frame plus when they were produced
+
+    landmarks is a (num_hands, 21, 3) array in normalized, mirrored frame
+    coordinates, or None when no hand was found. features holds the
+    HandFeatures of the first hand.
+    """
+
+    def __init__(self, landmarks, features, capture_time, completed_time, inference_time):
+        self.landmarks = landmarks
+        self.features = features
+        self.capture_time = capture_time
+        self.completed_time = completed_time
+        self.inference_time = inference_time
+
+    def age(self, now=None):
+        """Seconds since the underlying frame was captured"""
+        if now is None:
+            now = time.perf_counter()
+        return now - self.capture_time
+
+
+class FramePreprocessor:
+    """Resizes and color converts camera frames into preallocated buffers
+
+    Buffers are kept per output shape, so once the shapes in use have been
+    seen no further arrays are allocated. allocations counts every buffer
+    created, including any OpenCV had to allocate behind our back.
+    """
+
+    def __init__(self):
+        self._buffers = {}
+        self.allocations = 0
+
+    def _buffer(self, shape):
+        buffer = self._buffers.get(shape)
+        if buffer is None:
+            buffer = np.empty(shape, dtype=np.uint8)
+            self._buffers[shape] = buffer
+            self.allocations += 1
+        return buffer
+
+    def to_rgb(self, image, size=None):
+        """Return image (BGR, may be a view) as RGB, resized to size=(width, height) if given"""
+        if size is not None and (image.shape[1], image.shape[0]) != size:
+            output = self._buffer((size[1], size[0], 3))
+            result = cv2.resize(image, size, dst=output, interpolation=cv2.INTER_AREA)
+            if result is not output:
+                self.allocations += 1
+            # Converting in place saves a second buffer
+            cv2.cvtColor(result, cv2.COLOR_BGR2RGB, dst=result)
+            return result
+
+        output = self._buffer(image.shape)
+        result = cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=output)
+        if result is not output:
+            self.allocations += 1
+        return result
+
+
+class RoiTracker:
+    """Decides which part of each camera frame is handed to MediaPipe
+
+    While a hand is tracked only a square crop around it is color converted
+    and processed, resized to roi_size pixels. When the hand is lost the next
+    frame is searched in full (downscaled to full_frame_width) to reacquire
+    it. Frames are never flipped: landmarks are mirrored instead and always
+    mapped back to normalized coordinates of the full mirrored frame, so
+    callers can keep multiplying by window_width/window_height as before.
+    """
+
+    def __init__(self, roi_size=256, full_frame_width=480, margin=0.75, edge_fraction=0.15, use_roi=True):
+        self.roi_size = roi_size
+        self.full_frame_width = full_frame_width
+        self.margin = margin
+        self.edge_fraction = edge_fraction
+        self.use_roi = use_roi
+        self.preprocessor = FramePreprocessor()
+
+        # Current crop as (x, y, width, height) normalized in camera (unmirrored) coordinates
+        self.roi = None
+
+        # Statistics
+        self.roi_frames = 0
+        self.full_frames = 0
+        self.reacquisitions = 0
+
+    def prepare(self, frame):
+        """Return (rgb_image, region) ready for MediaPipe"""
+        frame_height, frame_width = frame.shape[:2]
+
+        if self.roi is None:
+            self.full_frames += 1
+            region = (0.0, 0.0, 1.0, 1.0)
+            size = None
+            if frame_width > self.full_frame_width:
+                size = (self.full_frame_width, frame_height * self.full_frame_width // frame_width)
+            return self.preprocessor.to_rgb(frame, size), region
+
+        self.roi_frames += 1
+        region = self.roi
+        roi_x, roi_y, roi_width, roi_height = region
+        side = int(round(roi_width * frame_width))
+        left = int(round(roi_x * frame_width))
+        top = int(round(roi_y * frame_height))
+        # Slicing is a view; the only copy is the resize into the ROI buffer
+        crop = frame[top:top + side, left:left + side]
+        return self.preprocessor.to_rgb(crop, (self.roi_size, self.roi_size)), region
+
+    def update(self, multi_hand_landmarks, region, frame_shape):
+        """Return landmarks as an array in full mirrored-frame coordinates and move the ROI
+
+        Returns None when no hand was found.
+        """
+        if not multi_hand_landmarks:
+            if self.roi is not None:
+                self.reacquisitions += 1
+            self.roi = None
+            return None
+
+        # The only per-landmark Python access; everything after is array math
+        hands = landmarks_to_array(multi_hand_landmarks)
+        region_x, region_y, region_width, region_height = region
+        hands[..., 0] = region_x + hands[..., 0] * region_width
+        hands[..., 1] = region_y + hands[..., 1] * region_height
+
+        if self.use_roi:
+            self._follow(hand_bounds(hands[0]), frame_shape)
+
+        # Mirror so the hand moves the same way on screen as in a mirror
+        hands[..., 0] = 1.0 - hands[..., 0]
+        return hands
+
+    def _follow(self, bounds, frame_shape):
+        """Recenter the ROI only when the hand nears its edge or changes size"""
+        frame_height, frame_width = frame_shape[:2]
+        min_x, min_y, max_x, max_y = bounds
+
+        if self.roi is not None:
+            roi_x, roi_y, roi_width, roi_height = self.roi
+            inset_x = roi_width * self.edge_fraction
+            inset_y = roi_height * self.edge_fraction
+            hand_side = max((max_x - min_x) * frame_width, (max_y - min_y) * frame_height)
+            roi_side = roi_width * frame_width
+            if (min_x >= roi_x + inset_x and max_x <= roi_x + roi_width - inset_x and
+                    min_y >= roi_y + inset_y and max_y <= roi_y + roi_height - inset_y and
+                    roi_side * 0.3 <= hand_side <= roi_side * 0.7):
+                return
+
+        # Square crop in pixels around the hand, clamped to the frame
+        side = max((max_x - min_x) * frame_width, (max_y - min_y) * frame_height) * (1 + 2 * self.margin)
+        side = int(min(side, frame_width, frame_height))
+        if side <= 0:
+            self.roi = None
+            return
+        center_x = (min_x + max_x) / 2 * frame_width
+        center_y = (min_y + max_y) / 2 * frame_height
+        left = max(0, min(int(center_x - side / 2), frame_width - side))
+        top = max(0, min(int(center_y - side / 2), frame_height - side))
+        self.roi = (left / frame_width, top / frame_height, side / frame_width, side / frame_height)
+
+    def reset(self):
+        """Force a full-frame search on the next frame"""
+        self.roi = None
+
+
+class HandTrackingWorker:
+    """Pulls frames from a ThreadedCapture and runs MediaPipe Hands off the main thread"""
+
+    def __init__(self, capture, max_num_hands=1, min_detection_confidence=0.5, use_roi=True,
+                 rate_controller=None):
+        self.capture = capture
+        # Optional InferenceRateController deciding which camera frames get tracked
+        self.rate_controller = rate_controller
+        self.max_num_hands = max_num_hands
+        self.min_detection_confidence = min_detection_confidence
+        # Crops around the last known hand instead of processing every full frame
+        self.roi_tracker = RoiTracker(use_roi=use_roi)
+
+        self._lock = threading.Lock()
+        self._thread = None
+        self._running = False
+        self._result = None
+        # Set once the MediaPipe model has been loaded on the worker thread
+        self.model_ready = threading.Event()
+
+        # Statistics
+        self.frames_processed = 0
+        self.frames_skipped = 0
+        self.region_retries = 0
+        self.last_inference_time = 0.0
+
+    def start(self):
+        """Start the inference thread"""
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._inference_loop, name="hand-tracking", daemon=True)
+        self._thread.start()
+
+    def _inference_loop(self):
+        """Process the newest camera frame whenever one becomes available"""
+        # MediaPipe graphs are not thread safe, so the model lives on this thread
+        hands = mp.solutions.hands.Hands(static_image_mode=False,
+                                         max_num_hands=self.max_num_hands,
+                                         min_detection_confidence=self.min_detection_confidence)
+        self.model_ready.set()
+        frame_number = 0
+        previous_region = None
+        try:
+            while self._running:
+                frame, capture_time = self.capture.wait_for_frame(timeout=0.1)
+                if frame is None:
+                    # wait_for_frame() returns immediately once the camera is gone
+                    if not self.capture.is_running():
+                        time.sleep(0.1)
+                    continue
+
+                frame_number += 1
+                if self.rate_controller is not None and not self.rate_controller.should_process(frame_number):
+                    self.frames_skipped += 1
+                    continue
+
+                start_time = time.perf_counter()
+                rgb_frame, region = self.roi_tracker.prepare(frame)
+                results = hands.process(rgb_frame)
+                if not results.multi_hand_landmarks and region != previous_region:
+                    # MediaPipe follows a hand from where it was in the previous image. When the
+                    # crop moved, that position is wrong and the hand is lost; with no hand left
+                    # to follow, a second pass searches this image from scratch.
+                    results = hands.process(rgb_frame)
+                    self.region_retries += 1
+                previous_region = region
+                landmarks = self.roi_tracker.update(results.multi_hand_landmarks, region, frame.shape)
+                features = None
+                if landmarks is not None:
+                    features = compute_hand_features(landmarks[0], frame.shape[1] / frame.shape[0])
+                completed_time = time.perf_counter()
+
+                result = TrackingResult(landmarks, features, capture_time,
+                                        completed_time, completed_time - start_time)
+                with self._lock:
+                    self._result = result
+                    self.frames_processed += 1
+                    self.last_inference_time = result.inference_time
+                if self.rate_controller is not None:
+                    self.rate_controller.record_inference(result.inference_time * 1000)
+        finally:
+            self.model_ready.clear()
+            hands.close()
+
+    def latest(self):
+        """Return the most recent TrackingResult without waiting, or None"""
+        with self._lock:
+            return self._result
+
+    def stop(self):
+        """Stop the inference thread"""
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        with self._lock:
+            self._result = None
+        self.roi_tracker.reset()
+
+    def get_stats(self):
+        """Return inference and preprocessing counters for debugging"""
+        return {
+            "processed": self.frames_processed,
+            "skipped": self.frames_skipped,
+            "inference_ms": self.last_inference_time * 1000,
+            "roi_frames": self.roi_tracker.roi_frames,
+            "full_frames": self.roi_tracker.full_frames,
+            "reacquisitions": self.roi_tracker.reacquisitions,
+            "region_retries": self.region_retries,
+            "buffer_allocations": self.roi_tracker.preprocessor.allocations,
+        }
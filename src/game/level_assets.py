@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Per-level asset bundles for Kill the VC
+Each level's images and sounds are loaded the first time the level is needed,
+the next level can be loaded on a background thread while the player reads
+the level complete screen, and levels not played recently are dropped once
+their memory adds up past a budget
+"""
+
+import threading
+from collections import OrderedDict
+
+import pygame
+
+
+def asset_bytes(asset):
+    """Rough memory size of a loaded surface or sound, 0 for anything else"""
+    if isinstance(asset, pygame.Surface):
+        return asset.get_width() * asset.get_height() * asset.get_bytesize()
+    if isinstance(asset, pygame.mixer.Sound):
+        mixer = pygame.mixer.get_init()
+        if mixer is None:
+            return 0
+        frequency, size, channels = mixer
+        return int(asset.get_length() * frequency * channels * abs(size) // 8)
+    if isinstance(asset, tuple):
+        return sum(asset_bytes(item) for item in asset)
+    return 0
+
+
+class LevelAssets:
+    """Loads, preloads and evicts per-level bundles
+
+    load_level(level) returns a dict of the level's assets. get() returns it,
+    loading it first if needed; preload() does the loading on a background
+    thread. Levels in pinned are never evicted, nor is the level most
+    recently returned by get(). derived_bytes(bundle), if given, is the
+    memory of caches built from a bundle and counts towards its size.
+    Nothing is evicted until evict() is called, on the thread that uses the
+    derived caches; it calls on_evict(level, bundle) for each evicted
+    bundle so those caches can drop what they built from it.
+    """
+
+    def __init__(self, load_level, memory_budget=32 * 1024 * 1024, pinned=(), on_evict=None, derived_bytes=None):
+        self.load_level = load_level
+        self.memory_budget = memory_budget
+        self.pinned = set(pinned)
+        self.on_evict = on_evict
+        self.derived_bytes = derived_bytes
+
+        self._lock = threading.Lock()
+        self._bundles = OrderedDict()  # level -> bundle, least recently used first
+        self._sizes = {}
+        self._loading = {}  # level -> preload thread
+        self._current = None
+
+        # Statistics
+        self.loads = 0
+        self.preloads = 0
+        self.evictions = 0
+
+    def get(self, level):
+        """Return the bundle for level, waiting for or doing the load if needed"""
+        with self._lock:
+            self._current = level
+            thread = self._loading.get(level)
+            if thread is None:
+                bundle = self._bundles.get(level)
+                if bundle is not None:
+                    self._bundles.move_to_end(level)
+                    return bundle
+        if thread is not None:
+            thread.join()
+
+        with self._lock:
+            bundle = self._bundles.get(level)
+            if bundle is not None:
+                self._bundles.move_to_end(level)
+                return bundle
+        return self._load(level)
+
+    def evict(self):
+        """Drop the least recently used bundles while memory is over budget
+
+        Call it when the set of levels in use changes, e.g. when a level
+        starts, from the thread that uses the derived caches.
+        """
+        with self._lock:
+            evicted = self._evict()
+        if self.on_evict is not None:
+            for evicted_level, evicted_bundle in evicted:
+                self.on_evict(evicted_level, evicted_bundle)
+
+    def preload(self, level):
+        """Start loading level on a background thread if it isn't loaded or loading"""
+        with self._lock:
+            if level in self._bundles or level in self._loading:
+                return
+            thread = threading.Thread(target=self._preload, args=(level,), name=f"level-{level}-preload", daemon=True)
+            self._loading[level] = thread
+            self.preloads += 1
+        thread.start()
+
+    def _preload(self, level):
+        try:
+            self._load(level)
+        except Exception as e:
+            # get() will retry on the main thread and report the error there
+            print(f"Could not preload level {level}: {e}")
+        finally:
+            with self._lock:
+                self._loading.pop(level, None)
+
+    def _load(self, level):
+        bundle = self.load_level(level)
+        with self._lock:
+            self._bundles[level] = bundle
+            self._sizes[level] = sum(asset_bytes(asset) for asset in bundle.values())
+            self.loads += 1
+        return bundle
+
+    def _evict(self):
+        evicted = []
+        for level in list(self._bundles):
+            if self.memory_bytes() <= self.memory_budget:
+                break
+            if level in self.pinned or level == self._current or level in self._loading:
+                continue
+            evicted.append((level, self._bundles.pop(level)))
+            del self._sizes[level]
+            self.evictions += 1
+        return evicted
+
+    def peek(self, level):
+        """Return the bundle for level if it is loaded, without loading it or marking it used"""
+        with self._lock:
+            return self._bundles.get(level)
+
+    def memory_bytes(self):
+        total = sum(self._sizes.values())
+        if self.derived_bytes is not None:
+            total += sum(self.derived_bytes(bundle) for bundle in self._bundles.values())
+        return total
+
+    def view(self, name):
+        """Dict-like view of one asset across levels, e.g. view("background")[2]"""
+        return LevelAssetView(self, name)
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                "loaded": sorted(self._bundles),
+                "memory_bytes": self.memory_bytes(),
+                "loads": self.loads,
+                "preloads": self.preloads,
+                "evictions": self.evictions,
+            }
+
+
+class LevelAssetView:
+    """Indexes one asset of every level by level number, loading levels on demand"""
+
+    def __init__(self, level_assets, name):
+        self.level_assets = level_assets
+        self.name = name
+
+    def __getitem__(self, level):
+        return self.level_assets.get(level)[self.name]
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Landmark filtering and motion prediction for Kill the VC
+Smooths noisy fingertip positions with a One Euro filter and extrapolates
+them with the filtered velocity, so the ship gets a fresh position on every
+render tick even when hand tracking runs at a lower rate
+"""
+
+import math
+
+
+def smoothing_factor(elapsed, cutoff):
+    """Exponential smoothing factor for a low-pass filter at the given cutoff (Hz)"""
+    tau = 1.0 / (2 * math.pi * cutoff)
+    return 1.0 / (1.0 + tau / elapsed)
+
+
+class OneEuroFilter:
+    """One Euro filter for a single value (Casiez et al., CHI 2012)
+
+    Low speeds get a low cutoff (less jitter), high speeds a higher cutoff
+    (less lag). The filtered derivative is kept so callers can extrapolate.
+    """
+
+    def __init__(self, min_cutoff=1.0, beta=0.0, derivative_cutoff=1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.derivative_cutoff = derivative_cutoff
+        self.reset()
+
+    def reset(self):
+        self.value = None
+        self.derivative = 0.0
+        self.timestamp = None
+
+    def __call__(self, value, timestamp):
+        """Filter a new sample taken at timestamp (seconds) and return the smoothed value"""
+        if self.value is None:
+            self.value = value
+            self.derivative = 0.0
+            self.timestamp = timestamp
+            return value
+
+        elapsed = timestamp - self.timestamp
+        if elapsed <= 0:
+            return self.value
+
+        # Filter the derivative first, then use it to pick the value cutoff
+        raw_derivative = (value - self.value) / elapsed
+        alpha = smoothing_factor(elapsed, self.derivative_cutoff)
+        self.derivative = alpha * raw_derivative + (1 - alpha) * self.derivative
+
+        cutoff = self.min_cutoff + self.beta * abs(self.derivative)
+        alpha = smoothing_factor(elapsed, cutoff)
+        self.value = alpha * value + (1 - alpha) * self.value
+        self.timestamp = timestamp
+        return self.value
+
+
+class PointPredictor:
+    """Filters a 2D point and predicts where it is now from its filtered velocity
+
+    Positions are in screen pixels and timestamps in time.perf_counter()
+    seconds. Samples should be stamped with the camera capture time so the
+    prediction also covers capture and inference latency.
+    """
+
+    def __init__(self, min_cutoff=1.5, beta=0.01, derivative_cutoff=1.0, max_lookahead=0.1):
+        self.filter_x = OneEuroFilter(min_cutoff, beta, derivative_cutoff)
+        self.filter_y = OneEuroFilter(min_cutoff, beta, derivative_cutoff)
+        # Never extrapolate further than this, so a stalled tracker can't fling the ship
+        self.max_lookahead = max_lookahead
+
+    def reset(self):
+        """Forget the point, e.g. when the hand is lost"""
+        self.filter_x.reset()
+        self.filter_y.reset()
+
+    def has_position(self):
+        return self.filter_x.value is not None
+
+    def update(self, x, y, timestamp):
+        """Add a measured position"""
+        self.filter_x(x, timestamp)
+        self.filter_y(y, timestamp)
+
+    def predict(self, now):
+        """Return the predicted (x, y) at time now, or None before the first sample"""
+        if not self.has_position():
+            return None
+        lookahead = max(0.0, min(now - self.filter_x.timestamp, self.max_lookahead))
+        return (self.filter_x.value + self.filter_x.derivative * lookahead,
+                self.filter_y.value + self.filter_y.derivative * lookahead)
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Particle effects for Kill the VC
+Particles live in preallocated NumPy arrays, so spawning, moving and drawing
+thousands of them takes a handful of array operations per frame instead of
+a Python object and a draw call for each one
+"""
+
+import numpy as np
+import pygame
+
+
+class ParticleSystem:
+    """Fixed-capacity particle pool with oldest-first reuse
+
+    emit() writes new particles into the slots after the ones emitted last,
+    wrapping around, so once the pool is full the oldest particles are
+    replaced and the work per frame never grows past capacity. Positions
+    and speeds are in pixels and pixels per second.
+    """
+
+    def __init__(self, capacity=4096, bounds=(800, 600), gravity=(0.0, 300.0), drag=1.5, particle_size=3, seed=None):
+        self.capacity = capacity
+        self.bounds = bounds
+        self.gravity = np.array(gravity, np.float32)
+        self.drag = drag
+        self.particle_size = particle_size
+        self._rng = np.random.default_rng(seed)
+
+        self.position = np.zeros((capacity, 2), np.float32)
+        self.velocity = np.zeros((capacity, 2), np.float32)
+        self.age = np.zeros(capacity, np.float32)
+        self.lifetime = np.ones(capacity, np.float32)
+        self.color = np.zeros((capacity, 3), np.uint8)
+        self.alive = np.zeros(capacity, bool)
+        self._next = 0  # Slot the next particle is written to, always the oldest
+
+        # Each particle is a particle_size square around its position
+        low = -(particle_size // 2)
+        self._offsets = [(dx, dy) for dx in range(low, low + particle_size) for dy in range(low, low + particle_size)]
+        self._layer = None
+
+        # Statistics
+        self.emitted = 0
+        self.recycled = 0
+
+    def emit(self, position, count, color, speed=(60, 240), lifetime=(0.3, 0.8)):
+        """Spawn count particles at position flying out in random directions"""
+        count = min(int(count), self.capacity)
+        if count <= 0:
+            return
+        slots = (self._next + np.arange(count)) % self.capacity
+        self._next = (self._next + count) % self.capacity
+        self.recycled += int(np.count_nonzero(self.alive[slots]))
+        self.emitted += count
+
+        angle = self._rng.uniform(0, 2 * np.pi, count)
+        magnitude = self._rng.uniform(speed[0], speed[1], count)
+        self.position[slots] = position
+        self.velocity[slots, 0] = np.cos(angle) * magnitude
+        self.velocity[slots, 1] = np.sin(angle) * magnitude
+        self.age[slots] = 0
+        self.lifetime[slots] = self._rng.uniform(lifetime[0], lifetime[1], count)
+        brightness = self._rng.uniform(0.6, 1.0, (count, 1))
+        self.color[slots] = (np.array(color, np.float32) * brightness).astype(np.uint8)
+        self.alive[slots] = True
+
+    def update(self, dt):
+        """Advance every live particle by dt seconds and retire expired or off-screen ones"""
+        live = np.flatnonzero(self.alive)
+        if live.size == 0:
+            return
+        velocity = self.velocity[live] * max(0.0, 1.0 - self.drag * dt) + self.gravity * dt
+        position = self.position[live] + velocity * dt
+        age = self.age[live] + dt
+        self.velocity[live] = velocity
+        self.position[live] = position
+        self.age[live] = age
+
+        width, height = self.bounds
+        self.alive[live] = ((age < self.lifetime[live]) &
+                            (position[:, 0] >= 0) & (position[:, 0] < width) &
+                            (position[:, 1] >= 0) & (position[:, 1] < height))
+
+    def clear(self):
+        self.alive[:] = False
+
+    def live_count(self):
+        return int(np.count_nonzero(self.alive))
+
+    def _live_pixels(self):
+        live = np.flatnonzero(self.alive)
+        x = self.position[live, 0].astype(np.intp)
+        y = self.position[live, 1].astype(np.intp)
+        fade = 1.0 - self.age[live] / self.lifetime[live]
+        return x, y, self.color[live], fade
+
+    def draw(self, surface):
+        """Blend every live particle onto an opaque surface, fading out with age"""
+        x, y, color, fade = self._live_pixels()
+        if x.size == 0:
+            return
+        width, height = surface.get_size()
+        fade = fade[:, None]
+        color = color * fade
+        pixels = pygame.surfarray.pixels3d(surface)
+        for dx, dy in self._offsets:
+            px = np.clip(x + dx, 0, width - 1)
+            py = np.clip(y + dy, 0, height - 1)
+            pixels[px, py] = (pixels[px, py] * (1 - fade) + color).astype(np.uint8)
+        # Release the pixel array so the surface is unlocked again
+        del pixels
+
+    def render_layer(self):
+        """Draw the live particles onto a transparent surface
+
+        Returns (surface, topleft) covering just the particles, or None when
+        there are none. The surface is reused by the next call.
+        """
+        x, y, color, fade = self._live_pixels()
+        if x.size == 0:
+            return None
+        width, height = self.bounds
+        low = self._offsets[0][0]
+        left = max(0, int(x.min()) + low)
+        top = max(0, int(y.min()) + low)
+        right = min(width, int(x.max()) + low + self.particle_size)
+        bottom = min(height, int(y.max()) + low + self.particle_size)
+
+        if self._layer is None:
+            self._layer = pygame.Surface(self.bounds, pygame.SRCALPHA)
+        layer = self._layer.subsurface((left, top, right - left, bottom - top))
+        layer.fill((0, 0, 0, 0))
+        rgb = pygame.surfarray.pixels3d(layer)
+        alpha = pygame.surfarray.pixels_alpha(layer)
+        fade = (fade * 255).astype(np.uint8)
+        for dx, dy in self._offsets:
+            px = np.clip(x + dx - left, 0, right - left - 1)
+            py = np.clip(y + dy - top, 0, bottom - top - 1)
+            rgb[px, py] = color
+            alpha[px, py] = np.maximum(alpha[px, py], fade)
+        del rgb, alpha
+        return layer, (left, top)
+
+    def get_stats(self):
+        return {
+            "live": self.live_count(),
+            "capacity": self.capacity,
+            "emitted": self.emitted,
+            "recycled": self.recycled,
+        }
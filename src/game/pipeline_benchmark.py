@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Headless benchmark for the Kill the VC hand tracking pipeline
+Runs frame source -> threaded capture -> hand tracking -> ship steering
+without opening a window or needing a webcam
+"""
+
+import argparse
+import math
+import sys
+import time
+
+from capture import ThreadedCapture
+from frame_sources import open_frame_source
+from hand_features import INDEX_FINGER_TIP
+from hand_tracking import HandTrackingWorker
+from motion_filter import PointPredictor
+
+# Same playfield and steering constants as game.py
+WINDOW_WIDTH, WINDOW_HEIGHT = 800, 600
+SPACESHIP_WIDTH, SPACESHIP_HEIGHT = 100, 100
+SENSITIVITY = 0.1
+
+
+def run_benchmark(source_spec, duration, tick_rate, use_roi):
+    """Run the pipeline for duration seconds and return a dict of measurements"""
+    source = open_frame_source(source_spec)
+    capture = ThreadedCapture(source)
+    if not capture.start():
+        return None
+    tracker = HandTrackingWorker(capture, use_roi=use_roi)
+    tracker.start()
+
+    spaceship_x = WINDOW_WIDTH // 2 - SPACESHIP_WIDTH // 2
+    spaceship_y = WINDOW_HEIGHT - SPACESHIP_HEIGHT
+    finger_predictor = PointPredictor()
+
+    # The synthetic hand knows where its fingertip really is
+    ground_truth = hasattr(source, "fingertip_position")
+
+    ticks = 0
+    results_seen = 0
+    hands_seen = 0
+    total_age = 0.0
+    fingertip_errors = []
+    last_result = None
+    tick_interval = 1.0 / tick_rate
+
+    start_time = time.perf_counter()
+    next_tick = start_time
+    while time.perf_counter() - start_time < duration:
+        now = time.perf_counter()
+        result = tracker.latest()
+        if result is not None and result is not last_result:
+            last_result = result
+            results_seen += 1
+            total_age += result.age(now)
+            if result.landmarks is not None:
+                hands_seen += 1
+                index_finger_tip = result.landmarks[0, INDEX_FINGER_TIP]
+                frame_index = source.frame_index_at(result.capture_time) if ground_truth else None
+                if frame_index is not None:
+                    true_x, true_y = source.fingertip_position(frame_index)
+                    # Mean distance in playfield pixels, as the fingertip steers the ship
+                    fingertip_errors.append(math.hypot((index_finger_tip[0] - true_x) * WINDOW_WIDTH,
+                                                       (index_finger_tip[1] - true_y) * WINDOW_HEIGHT))
+                finger_predictor.update(index_finger_tip[0] * WINDOW_WIDTH,
+                                        index_finger_tip[1] * WINDOW_HEIGHT, result.capture_time)
+            else:
+                finger_predictor.reset()
+
+        # Ship steering towards the predicted fingertip, as in the GAME state
+        predicted_finger = finger_predictor.predict(now)
+        if predicted_finger is not None:
+            displacement_x = int(predicted_finger[0]) - (spaceship_x + SPACESHIP_WIDTH // 2)
+            displacement_y = int(predicted_finger[1]) - (spaceship_y + SPACESHIP_HEIGHT // 2)
+            spaceship_x += int(displacement_x * SENSITIVITY)
+            spaceship_y -= int(displacement_y * SENSITIVITY)
+            spaceship_x = max(0, min(spaceship_x, WINDOW_WIDTH - SPACESHIP_WIDTH))
+            spaceship_y = max(WINDOW_HEIGHT // 2, min(spaceship_y, WINDOW_HEIGHT - SPACESHIP_HEIGHT))
+
+        ticks += 1
+        next_tick += tick_interval
+        delay = next_tick - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+    elapsed = time.perf_counter() - start_time
+    tracker.stop()
+    capture.release()
+
+    capture_stats = capture.get_stats()
+    tracker_stats = tracker.get_stats()
+    return {
+        "source": repr(source),
+        "elapsed": elapsed,
+        "tick_fps": ticks / elapsed,
+        "capture_fps": capture_stats["captured"] / elapsed,
+        "requested_fps": capture_stats["requested_fps"],
+        "frames_dropped": capture_stats["dropped"],
+        "inference_fps": tracker.frames_processed / elapsed,
+        "last_inference_ms": tracker.last_inference_time * 1000,
+        "mean_result_age_ms": total_age / results_seen * 1000 if results_seen else None,
+        "hand_detection_rate": hands_seen / results_seen if results_seen else None,
+        "fingertip_error_px": sum(fingertip_errors) / len(fingertip_errors) if fingertip_errors else None,
+        "capture_allocations": capture_stats["buffer_allocations"],
+        "source_copies": capture_stats["source_copies"],
+        # Which preprocessing path the allocation counts above cover
+        "roi_frames": tracker_stats["roi_frames"],
+        "full_frames": tracker_stats["full_frames"],
+        "preprocess_allocations": tracker_stats["buffer_allocations"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the hand tracking pipeline headless")
+    parser.add_argument("--source", default="synthetic",
+                        help='Camera number, video file, image folder/glob or "synthetic"')
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run")
+    parser.add_argument("--tick-rate", type=float, default=60.0, help="Simulated game loop rate")
+    parser.add_argument("--full-frame", action="store_true", help="Disable region-of-interest tracking")
+    args = parser.parse_args()
+
+    print(f"Benchmarking {args.source} for {args.duration:.0f}s...")
+    results = run_benchmark(args.source, args.duration, args.tick_rate, not args.full_frame)
+    if results is None:
+        print("ERROR: Could not open frame source")
+        return 1
+
+    for name, value in results.items():
+        if isinstance(value, float):
+            value = f"{value:.2f}"
+        print(f"{name:>22}: {value}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
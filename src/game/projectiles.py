@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Projectile pool for Kill the VC
+Every laser shot in flight lives in preallocated NumPy arrays, so the game
+can have many shots at once and move and collide them all with a few array
+operations per simulation step
+"""
+
+import numpy as np
+
+
+class ProjectilePool:
+    """Fixed-capacity pool of shots with array-backed positions and speeds
+
+    x, y is the tip of each shot and vx, vy its speed in pixels per
+    simulation step. Shots leaving the area from (0, 0) to bounds are
+    retired. When every slot is in use, fire() launches only as many shots
+    as there are free slots.
+    """
+
+    def __init__(self, capacity=64, bounds=(800, 600)):
+        self.capacity = capacity
+        self.bounds = bounds
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.alive = np.zeros(capacity, bool)
+
+        # Positions before the last step, for drawing in between steps
+        self.previous_x = np.zeros(capacity)
+        self.previous_y = np.zeros(capacity)
+
+        # Statistics
+        self.fired = 0
+        self.dropped = 0
+
+    def fire(self, x, y, speed, angles=(0.0,)):
+        """Launch one shot per angle from (x, y), angles in degrees from straight up
+
+        Returns the number of shots actually launched.
+        """
+        free = np.flatnonzero(~self.alive)[:len(angles)]
+        self.dropped += len(angles) - free.size
+        if free.size == 0:
+            return 0
+        radians = np.radians(np.asarray(angles[:free.size], np.float64))
+        self.x[free] = x
+        self.y[free] = y
+        self.vx[free] = np.sin(radians) * speed
+        self.vy[free] = -np.cos(radians) * speed
+        self.previous_x[free] = x
+        self.previous_y[free] = y
+        self.alive[free] = True
+        self.fired += free.size
+        return free.size
+
+    def step(self):
+        """Move every shot one simulation step and retire the ones that left the area"""
+        self.previous_x[:] = self.x
+        self.previous_y[:] = self.y
+        live = self.alive
+        self.x[live] += self.vx[live]
+        self.y[live] += self.vy[live]
+
+        width, height = self.bounds
+        self.alive &= (self.x >= 0) & (self.x < width) & (self.y > 0) & (self.y < height)
+
+    def live_indices(self):
+        return np.flatnonzero(self.alive)
+
+    def retire(self, indices):
+        self.alive[indices] = False
+
+    def clear(self):
+        self.alive[:] = False
+
+    def interpolated(self, indices, alpha):
+        """Positions of the given shots alpha of the way from the previous step to the current one"""
+        return (self.previous_x[indices] + (self.x[indices] - self.previous_x[indices]) * alpha,
+                self.previous_y[indices] + (self.y[indices] - self.previous_y[indices]) * alpha)
+
+    def get_stats(self):
+        return {
+            "live": int(np.count_nonzero(self.alive)),
+            "capacity": self.capacity,
+            "fired": self.fired,
+            "dropped": self.dropped,
+        }
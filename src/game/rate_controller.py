@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Adaptive hand tracking rate for Kill the VC
+Watches how long each rendered frame and each inference takes and decides
+whether hand tracking runs on every camera frame, every 2nd or every 3rd,
+so rendering stays within its frame budget on slow machines
+"""
+
+import threading
+import time
+
+
+class InferenceRateController:
+    """Picks a tracking stride (1 = every camera frame) that keeps frames within budget
+
+    The game loop reports how long each frame took to produce (excluding the
+    frame-rate limiter's sleep) and the tracking worker reports inference
+    times. Every adjust_interval seconds the stride goes up if frames are over
+    budget and back down if there is clear headroom. A stride that recently
+    blew the budget is not retried for retry_after seconds, which stops the
+    controller from flapping on machines that sit right at the limit.
+    """
+
+    def __init__(self, frame_budget_ms=1000 / 60, max_stride=3, adjust_interval=0.5,
+                 headroom=0.7, retry_after=10.0, smoothing=0.1):
+        self.frame_budget_ms = frame_budget_ms
+        self.max_stride = max_stride
+        self.adjust_interval = adjust_interval
+        self.headroom = headroom
+        self.retry_after = retry_after
+        self.smoothing = smoothing
+
+        self._lock = threading.Lock()
+        self.stride = 1
+        self.frame_time_ms = None
+        self.inference_time_ms = None
+        self._last_adjust = None
+        # stride -> time it last went over budget
+        self._over_budget_at = {}
+
+    def _average(self, current, sample):
+        if current is None:
+            return sample
+        return current + (sample - current) * self.smoothing
+
+    def record_inference(self, inference_time_ms):
+        """Called by the tracking worker after each inference"""
+        with self._lock:
+            self.inference_time_ms = self._average(self.inference_time_ms, inference_time_ms)
+
+    def record_frame(self, frame_time_ms, now=None):
+        """Called by the game loop once per rendered frame"""
+        if now is None:
+            now = time.perf_counter()
+        with self._lock:
+            self.frame_time_ms = self._average(self.frame_time_ms, frame_time_ms)
+            if self._last_adjust is None:
+                self._last_adjust = now
+            elif now - self._last_adjust >= self.adjust_interval:
+                self._last_adjust = now
+                self._adjust(now)
+
+    def _adjust(self, now):
+        if self.frame_time_ms > self.frame_budget_ms:
+            self._over_budget_at[self.stride] = now
+            if self.stride < self.max_stride:
+                self.stride += 1
+        elif self.stride > 1 and self.frame_time_ms < self.frame_budget_ms * self.headroom:
+            failed_at = self._over_budget_at.get(self.stride - 1)
+            if failed_at is None or now - failed_at >= self.retry_after:
+                self.stride -= 1
+
+    def should_process(self, frame_number):
+        """Whether the worker should run inference on this camera frame"""
+        return frame_number % self.stride == 0
+
+    def get_stats(self):
+        """Return the current decision and the measurements behind it"""
+        with self._lock:
+            return {
+                "stride": self.stride,
+                "frame_ms": self.frame_time_ms,
+                "inference_ms": self.inference_time_ms,
+                "budget_ms": self.frame_budget_ms,
+            }
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Render backends for Kill the VC
+SurfaceCanvas draws gameplay with software Surface blits like the rest of
+the game. TextureCanvas draws it with an SDL Renderer instead: every sprite
+is uploaded once as a texture and rotation and scaling are done by the
+renderer, on the GPU when one is available. Either way the game draws at a
+fixed logical resolution and SDL scales the frame to the window.
+"""
+
+import os
+import weakref
+
+import pygame
+
+try:
+    from pygame._sdl2 import video
+except ImportError:
+    # pygame._sdl2 only exists in pygame 2
+    video = None
+
+
+# How the frame is filtered when it is scaled to the window
+SCALE_FILTERS = ("linear", "nearest")
+
+# Window of the display surface, when it was resized through pygame._sdl2. pygame destroys the
+# SDL window when this object is garbage collected, so it is kept for the life of the display.
+_display_window = None
+
+
+def parse_size(text):
+    """Parse "WIDTHxHEIGHT" into a (width, height) tuple, or return None if it isn't one"""
+    try:
+        width, height = (int(n) for n in text.lower().split("x"))
+    except ValueError:
+        return None
+    if width <= 0 or height <= 0:
+        return None
+    return (width, height)
+
+
+def set_scale_filter(name):
+    """Choose the filter SDL scales the frame with; call before opening the window"""
+    if name not in SCALE_FILTERS:
+        print(f"Unknown scale filter {name!r}, expected one of {', '.join(SCALE_FILTERS)}")
+        return
+    # SDL reads the hint when it creates textures, and the environment variable takes precedence
+    # over the default pygame sets for pygame.SCALED
+    os.environ["SDL_RENDER_SCALE_QUALITY"] = name
+
+
+def open_scaled_display(logical_size, window_size=None, fullscreen=False):
+    """Open the game window and return a display surface of logical_size
+
+    When the window is a different size or fullscreen, SDL scales each frame
+    to it, letterboxed to keep the aspect ratio, so the cost of drawing does
+    not grow with the size of the screen.
+    """
+    window_size = window_size or logical_size
+    if fullscreen:
+        return pygame.display.set_mode(logical_size, pygame.SCALED | pygame.FULLSCREEN)
+    if tuple(window_size) == tuple(logical_size):
+        return pygame.display.set_mode(logical_size)
+
+    global _display_window
+    screen = pygame.display.set_mode(logical_size, pygame.SCALED | pygame.RESIZABLE)
+    if video is not None:
+        _display_window = video.Window.from_display_module()
+        _display_window.size = window_size
+    return screen
+
+
+class SurfaceCanvas:
+    """Gameplay drawing operations on a pygame Surface"""
+
+    name = "surface"
+
+    def __init__(self, surface, rotation_cache):
+        self.surface = surface
+        self.rotation_cache = rotation_cache
+
+    def blit(self, image, position):
+        self.surface.blit(image, position)
+
+    def blit_once(self, image, position):
+        self.surface.blit(image, position)
+
+    def fill(self, color, rect=None):
+        self.surface.fill(color, rect)
+
+    def blit_rotated(self, image, angle, center):
+        """Draw image rotated counterclockwise by angle degrees around center"""
+        self.rotation_cache.blit_centered(self.surface, image, angle, center)
+
+    def circle(self, color, center, radius, width=0):
+        pygame.draw.circle(self.surface, color, center, radius, width)
+
+    def draw_particles(self, particles):
+        particles.draw(self.surface)
+
+
+class TextureCanvas:
+    """Gameplay drawing operations on an SDL Renderer
+
+    Owns the game window in place of pygame.display.set_mode(). Surfaces
+    passed to blit() are uploaded the first time they are drawn and the
+    texture is reused for as long as the surface exists, so they must not be
+    drawn on afterwards; use blit_once() for surfaces that change. Set
+    SDL_RENDER_DRIVER=software to force SDL's software renderer, e.g. on
+    headless machines.
+
+    Drawing is in logical coordinates of size, scaled to the window. By
+    default sprites are rasterized at the window's resolution; with
+    render_to_texture the frame is drawn into a texture of size and only
+    that texture is scaled, which is cheaper on large displays.
+    """
+
+    name = "texture"
+
+    def __init__(self, size, title, vsync=False, window_size=None, fullscreen=False, render_to_texture=False):
+        if video is None:
+            raise RuntimeError("the texture renderer needs pygame 2 (pygame._sdl2)")
+        self.size = size
+        self.window = video.Window(title, size=window_size or size, resizable=True, fullscreen_desktop=fullscreen)
+        self.renderer = video.Renderer(self.window, vsync=vsync)
+        self.renderer.logical_size = size
+        self._target = None
+        if render_to_texture:
+            self._target = video.Texture(self.renderer, size, target=True)
+            self.renderer.target = self._target
+        self._textures = weakref.WeakKeyDictionary()
+        self._circles = {}
+        self._frame_texture = None
+
+        # Statistics
+        self.uploads = 0
+
+    def texture(self, image):
+        """Return the texture for image, uploading it on first use"""
+        texture = self._textures.get(image)
+        if texture is None:
+            texture = video.Texture.from_surface(self.renderer, image)
+            self._textures[image] = texture
+            self.uploads += 1
+        return texture
+
+    def blit(self, image, position):
+        texture = self.texture(image)
+        texture.draw(dstrect=(int(position[0]), int(position[1]), texture.width, texture.height))
+
+    def blit_once(self, image, position):
+        """Draw a surface that will not be drawn again in the same state, without caching it"""
+        texture = video.Texture.from_surface(self.renderer, image)
+        texture.draw(dstrect=(int(position[0]), int(position[1]), texture.width, texture.height))
+
+    def fill(self, color, rect=None):
+        self.renderer.draw_color = pygame.Color(color)
+        if rect is None:
+            self.renderer.clear()
+        else:
+            self.renderer.fill_rect(rect)
+
+    def blit_rotated(self, image, angle, center):
+        """Draw image rotated counterclockwise by angle degrees around center"""
+        texture = self.texture(image)
+        rect = pygame.Rect(0, 0, texture.width, texture.height)
+        rect.center = (int(center[0]), int(center[1]))
+        # SDL rotates clockwise, pygame.transform.rotate counterclockwise
+        texture.draw(dstrect=rect, angle=-angle)
+
+    def circle(self, color, center, radius, width=0):
+        key = (tuple(color), radius, width)
+        image = self._circles.get(key)
+        if image is None:
+            image = pygame.Surface((radius * 2 + 1, radius * 2 + 1), pygame.SRCALPHA)
+            pygame.draw.circle(image, color, (radius, radius), radius, width)
+            self._circles[key] = image
+        self.blit(image, (center[0] - radius, center[1] - radius))
+
+    def draw_particles(self, particles):
+        # Rasterized in software and uploaded each frame, like other changing surfaces
+        layer = particles.render_layer()
+        if layer is not None:
+            self.blit_once(*layer)
+
+    def present_surface(self, surface):
+        """Show a whole frame drawn in software, e.g. a menu"""
+        if self._frame_texture is None:
+            self._frame_texture = video.Texture(self.renderer, self.size, streaming=True)
+        self._frame_texture.update(surface)
+        self._show(self._frame_texture)
+
+    def present(self):
+        if self._target is None:
+            self.renderer.present()
+        else:
+            self._show(self._target)
+
+    def _show(self, texture):
+        # Draw a full frame texture to the window, then go back to drawing into the render target
+        self.renderer.target = None
+        self.renderer.draw_color = pygame.Color(0, 0, 0)
+        self.renderer.clear()
+        texture.draw()
+        self.renderer.present()
+        self.renderer.target = self._target
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Static screen cache for Kill the VC
+Menus and other screens that only change on a key press are composited once
+into an off-screen surface and redrawn only when their inputs change
+"""
+
+import pygame
+
+from assets import to_display_format
+
+
+class ScreenCache:
+    """Full-screen composites keyed by screen name
+
+    get() takes the screen's name, a tuple of everything that affects how it
+    looks and a function that draws it onto a surface. The composite is only
+    redrawn when the inputs differ from the ones it was last drawn with.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        # name -> (inputs, surface)
+        self._screens = {}
+
+        # Statistics
+        self.hits = 0
+        self.redraws = 0
+
+    def get(self, name, inputs, draw):
+        """Return the composite for name, calling draw(surface) if inputs changed"""
+        cached = self._screens.get(name)
+        if cached is not None and cached[0] == inputs:
+            self.hits += 1
+            return cached[1]
+
+        if cached is not None:
+            surface = cached[1]
+        else:
+            surface = to_display_format(pygame.Surface(self.size), alpha=False)
+        draw(surface)
+        self._screens[name] = (inputs, surface)
+        self.redraws += 1
+        return surface
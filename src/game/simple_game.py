@@ -15,10 +15,14 @@ except ImportError:
     print("ERROR: pygame module not found. Please install it with: pip install pygame")
     sys.exit(1)
 
+from text_cache import TextCache
+from render_backend import open_scaled_display, parse_size, set_scale_filter
+from spatial_hash import SpatialHash, boxes_overlap
+
 # Initialize pygame
 pygame.init()
 
-# Game constants
+# Game constants; the game is drawn at this size and scaled to the window
 WINDOW_WIDTH = 800
 WINDOW_HEIGHT = 600
 FPS = 60
@@ -37,13 +41,15 @@ game_over = False
 victory = False
 
 class Player:
+    __slots__ = ("x", "y")
+    width = 50
+    height = 50
+    speed = 8
+    color = BLUE
+
     def __init__(self):
-        self.width = 50
-        self.height = 50
         self.x = WINDOW_WIDTH // 2 - self.width // 2
         self.y = WINDOW_HEIGHT - self.height - 20
-        self.speed = 8
-        self.color = BLUE
         
     def draw(self, screen):
         pygame.draw.rect(screen, self.color, (self.x, self.y, self.width, self.height))
@@ -67,13 +73,18 @@ class Player:
             self.x = WINDOW_WIDTH - self.width
 
 class Laser:
+    __slots__ = ("x", "y", "active")
+    width = 5
+    height = 20
+    speed = 10
+    color = GREEN
+
     def __init__(self, x, y):
-        self.width = 5
-        self.height = 20
+        self.spawn(x, y)
+
+    def spawn(self, x, y):
         self.x = x
         self.y = y
-        self.speed = 10
-        self.color = GREEN
         self.active = True
         
     def draw(self, screen):
@@ -85,9 +96,14 @@ class Laser:
             self.active = False
 
 class Enemy:
+    __slots__ = ("x", "y", "speed_x", "speed_y", "color", "is_vc", "health")
+    width = 40
+    height = 40
+
     def __init__(self, is_vc=False):
-        self.width = 40
-        self.height = 40
+        self.spawn(is_vc)
+
+    def spawn(self, is_vc=False):
         self.x = random.randint(0, WINDOW_WIDTH - self.width)
         self.y = random.randint(50, 200)
         self.speed_x = random.randint(-3, 3)
@@ -125,20 +141,93 @@ class Enemy:
         if self.y > WINDOW_HEIGHT // 2:
             self.y = WINDOW_HEIGHT // 2
 
+class EntityPool:
+    """Live entities of one kind plus a free list of dead ones to recycle
+
+    acquire() re-spawns a released entity when there is one and only builds
+    a new one when the free list is empty. release_at() swap-removes: the
+    last live entity takes the released one's place, so nothing shifts but
+    the order of the live list is not kept.
+    """
+
+    def __init__(self, factory):
+        self.factory = factory
+        self.live = []
+        self._free = []
+
+        # Statistics
+        self.allocated = 0
+        self.reused = 0
+
+    def acquire(self, *args):
+        if self._free:
+            entity = self._free.pop()
+            entity.spawn(*args)
+            self.reused += 1
+        else:
+            entity = self.factory(*args)
+            self.allocated += 1
+        self.live.append(entity)
+        return entity
+
+    def release_at(self, index):
+        live = self.live
+        entity = live[index]
+        last = live.pop()
+        if index < len(live):
+            live[index] = last
+        self._free.append(entity)
+
+    def release_many(self, indices):
+        """Release several live indices; highest first so the swaps never move one still to release"""
+        for index in sorted(indices, reverse=True):
+            self.release_at(index)
+
+    def release_all(self):
+        self._free.extend(self.live)
+        self.live.clear()
+
+    def __len__(self):
+        return len(self.live)
+
+    def __iter__(self):
+        return iter(self.live)
+
+    def get_stats(self):
+        return {
+            "live": len(self.live),
+            "free": len(self._free),
+            "allocated": self.allocated,
+            "reused": self.reused,
+        }
+
 def main():
-    # Set up the game window
-    screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    # Set up the game window, sized and filtered like the full game
+    # (KILLTHEVC_WINDOW_SIZE, KILLTHEVC_FULLSCREEN, KILLTHEVC_SCALE_FILTER)
+    set_scale_filter(os.environ.get("KILLTHEVC_SCALE_FILTER", "linear"))
+    window_size = parse_size(os.environ.get("KILLTHEVC_WINDOW_SIZE", "")) or (WINDOW_WIDTH, WINDOW_HEIGHT)
+    fullscreen = os.environ.get("KILLTHEVC_FULLSCREEN", "") not in ("", "0")
+    screen = open_scaled_display((WINDOW_WIDTH, WINDOW_HEIGHT), window_size, fullscreen)
     pygame.display.set_caption("Kill the VC - Simple Mode")
     clock = pygame.time.Clock()
     
-    # Create game objects
+    # Create the UI font once; rendered strings are cached across frames
+    font = pygame.font.SysFont(None, 36)
+    text_cache = TextCache()
+    
+    # Lasers are bucketed by grid cell so each enemy is only tested against nearby lasers
+    collision_grid = SpatialHash(cell_size=64)
+    collision_pairs = 0
+    show_debug = False
+    
+    # Create game objects; dead lasers and enemies go back to their pool for reuse
     player = Player()
-    lasers = []
+    lasers = EntityPool(Laser)
     
     # Create enemies
-    enemies = []
+    enemies = EntityPool(Enemy)
     for i in range(5):
-        enemies.append(Enemy(is_vc=(i == 0)))  # First enemy is the VC
+        enemies.acquire(i == 0)  # First enemy is the VC
     
     # Game loop
     global game_over, victory, score, level
@@ -152,11 +241,13 @@ def main():
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     running = False
+                elif event.key == pygame.K_F3:
+                    show_debug = not show_debug
                 elif event.key == pygame.K_SPACE and not game_over:
                     # Fire laser
                     laser_x = player.x + player.width // 2 - 2
                     laser_y = player.y - 20
-                    lasers.append(Laser(laser_x, laser_y))
+                    lasers.acquire(laser_x, laser_y)
                 elif event.key == pygame.K_RETURN and (game_over or victory):
                     # Restart game
                     game_over = False
@@ -164,10 +255,10 @@ def main():
                     score = 0
                     level = 1
                     player = Player()
-                    lasers = []
-                    enemies = []
+                    lasers.release_all()
+                    enemies.release_all()
                     for i in range(5):
-                        enemies.append(Enemy(is_vc=(i == 0)))
+                        enemies.acquire(i == 0)
         
         if not game_over and not victory:
             # Handle keyboard input
@@ -177,45 +268,64 @@ def main():
             if keys[pygame.K_RIGHT]:
                 player.move("right")
             
-            # Update lasers
-            for laser in lasers[:]:
-                laser.move()
-                if not laser.active:
-                    lasers.remove(laser)
+            # Update lasers, releasing the ones that left the screen; walking
+            # backwards means a swap-remove only moves a laser already updated
+            live_lasers = lasers.live
+            for index in range(len(live_lasers) - 1, -1, -1):
+                live_lasers[index].move()
+                if not live_lasers[index].active:
+                    lasers.release_at(index)
+            
+            collision_grid.clear()
+            for index, laser in enumerate(live_lasers):
+                collision_grid.insert(index, laser.x, laser.y, laser.width, laser.height)
             
             # Update enemies
-            for enemy in enemies[:]:
+            hit_lasers = set()
+            destroyed = []
+            vc_destroyed = False
+            for enemy_index, enemy in enumerate(enemies.live):
                 enemy.move()
                 
-                # Check for laser collisions
-                for laser in lasers[:]:
-                    if (laser.x >= enemy.x and laser.x <= enemy.x + enemy.width and
-                        laser.y >= enemy.y and laser.y <= enemy.y + enemy.height):
+                # Check for collisions with the lasers sharing a grid cell
+                for index in sorted(collision_grid.query(enemy.x, enemy.y, enemy.width, enemy.height)):
+                    if index in hit_lasers:
+                        continue
+                    laser = live_lasers[index]
+                    if boxes_overlap(laser.x, laser.y, laser.width, laser.height,
+                                     enemy.x, enemy.y, enemy.width, enemy.height):
                         # Hit!
                         if enemy.is_vc:
                             enemy.health -= 10
                             score += 10
                             if enemy.health <= 0:
-                                enemies.remove(enemy)
-                                # Check if all enemies are defeated
-                                if not any(e.is_vc for e in enemies):
-                                    if level < 3:
-                                        # Advance to next level
-                                        level += 1
-                                        # Create new enemies for next level
-                                        enemies = []
-                                        for i in range(5 + level):
-                                            enemies.append(Enemy(is_vc=(i == 0)))
-                                            enemies[-1].speed_x *= level  # Faster enemies in higher levels
-                                    else:
-                                        # Victory!
-                                        victory = True
+                                destroyed.append(enemy_index)
+                                vc_destroyed = True
                         else:
-                            enemies.remove(enemy)
+                            destroyed.append(enemy_index)
                             score += 5
                         
-                        lasers.remove(laser)
+                        hit_lasers.add(index)
                         break
+            collision_pairs = collision_grid.take_candidate_pairs()
+            
+            lasers.release_many(hit_lasers)
+            if destroyed:
+                enemies.release_many(destroyed)
+                
+                # Check if all enemies are defeated
+                if vc_destroyed and not any(e.is_vc for e in enemies):
+                    if level < 3:
+                        # Advance to next level
+                        level += 1
+                        # Create new enemies for next level
+                        enemies.release_all()
+                        for i in range(5 + level):
+                            enemy = enemies.acquire(i == 0)
+                            enemy.speed_x *= level  # Faster enemies in higher levels
+                    else:
+                        # Victory!
+                        victory = True
         
         # Draw everything
         screen.fill(BLACK)
@@ -232,32 +342,42 @@ def main():
             enemy.draw(screen)
         
         # Draw UI
-        font = pygame.font.SysFont(None, 36)
-        score_text = font.render(f"Score: {score}", True, WHITE)
+        score_text = text_cache.render(font, f"Score: {score}", True, WHITE)
         screen.blit(score_text, (10, 10))
         
-        level_text = font.render(f"Level: {level}/3", True, WHITE)
+        level_text = text_cache.render(font, f"Level: {level}/3", True, WHITE)
         screen.blit(level_text, (10, 50))
         
+        # F3 shows how many laser-enemy pairs got the exact collision test this
+        # frame and how full the entity pools are (live / ever allocated)
+        if show_debug:
+            pairs_text = text_cache.render(font, f"Collision pairs: {collision_pairs}", True, (150, 150, 150))
+            screen.blit(pairs_text, (10, 90))
+            for row, (name, pool) in enumerate((("Lasers", lasers), ("Enemies", enemies))):
+                stats = pool.get_stats()
+                pool_text = text_cache.render(font, f"{name}: {stats['live']} / {stats['allocated']} ({stats['reused']} reused)",
+                                              True, (150, 150, 150))
+                screen.blit(pool_text, (10, 130 + row * 40))
+        
         # Draw game over or victory screen
         if game_over:
-            game_over_text = font.render("GAME OVER", True, RED)
+            game_over_text = text_cache.render(font, "GAME OVER", True, RED)
             screen.blit(game_over_text, (WINDOW_WIDTH // 2 - game_over_text.get_width() // 2, 
                                         WINDOW_HEIGHT // 2 - game_over_text.get_height() // 2))
             
-            restart_text = font.render("Press ENTER to restart or ESC to quit", True, WHITE)
+            restart_text = text_cache.render(font, "Press ENTER to restart or ESC to quit", True, WHITE)
             screen.blit(restart_text, (WINDOW_WIDTH // 2 - restart_text.get_width() // 2, 
                                       WINDOW_HEIGHT // 2 + 50))
         elif victory:
-            victory_text = font.render("VICTORY! You defeated all VCs!", True, GREEN)
+            victory_text = text_cache.render(font, "VICTORY! You defeated all VCs!", True, GREEN)
             screen.blit(victory_text, (WINDOW_WIDTH // 2 - victory_text.get_width() // 2, 
                                       WINDOW_HEIGHT // 2 - victory_text.get_height() // 2))
             
-            final_score_text = font.render(f"Final Score: {score}", True, WHITE)
+            final_score_text = text_cache.render(font, f"Final Score: {score}", True, WHITE)
             screen.blit(final_score_text, (WINDOW_WIDTH // 2 - final_score_text.get_width() // 2, 
                                          WINDOW_HEIGHT // 2 + 50))
             
-            restart_text = font.render("Press ENTER to play again or ESC to quit", True, WHITE)
+            restart_text = text_cache.render(font, "Press ENTER to play again or ESC to quit", True, WHITE)
             screen.blit(restart_text, (WINDOW_WIDTH // 2 - restart_text.get_width() // 2, 
                                      WINDOW_HEIGHT // 2 + 100))
         
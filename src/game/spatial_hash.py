@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Spatial hash broadphase for Kill the VC
+Boxes are bucketed by the cells of a uniform grid they overlap, so a
+collision check only has to run the exact test against things in the same
+cells instead of against everything on screen
+"""
+
+
+class SpatialHash:
+    """Uniform grid keyed on integer cell coordinates
+
+    insert() the boxes of one group (enemies, lasers) under any item
+    identifier, then query() with a box of the other group to get the items
+    that might touch it. Every item query() returns is a candidate pair for
+    the exact test; they are counted until take_candidate_pairs() is called.
+    """
+
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self._cells = {}  # (cell_x, cell_y) -> [item, ...]
+
+        # Statistics
+        self.candidate_pairs = 0
+
+    def _cells_for(self, x, y, width, height):
+        size = self.cell_size
+        for cell_x in range(int(x // size), int((x + width) // size) + 1):
+            for cell_y in range(int(y // size), int((y + height) // size) + 1):
+                yield (cell_x, cell_y)
+
+    def clear(self):
+        """Remove every item, e.g. before inserting this frame's positions"""
+        self._cells.clear()
+
+    def insert(self, item, x, y, width=0, height=0):
+        for cell in self._cells_for(x, y, width, height):
+            bucket = self._cells.get(cell)
+            if bucket is None:
+                self._cells[cell] = [item]
+            else:
+                bucket.append(item)
+
+    def query(self, x, y, width=0, height=0):
+        """Items sharing a cell with the box, each once"""
+        found = {}
+        for cell in self._cells_for(x, y, width, height):
+            for item in self._cells.get(cell, ()):
+                found[item] = True
+        self.candidate_pairs += len(found)
+        return list(found)
+
+    def take_candidate_pairs(self):
+        """Return the candidate pairs counted since the last call and start counting again"""
+        count = self.candidate_pairs
+        self.candidate_pairs = 0
+        return count
+
+
+def boxes_overlap(x1, y1, width1, height1, x2, y2, width2, height2):
+    """Exact test for two axis-aligned boxes, touching edges included"""
+    return x1 <= x2 + width2 and x2 <= x1 + width1 and y1 <= y2 + height2 and y2 <= y1 + height1
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Rotation sprite cache for Kill the VC
+Spinning enemies are drawn from copies of their sprite pre-rotated at a fixed
+set of angles instead of calling pygame.transform.rotate every frame
+"""
+
+from collections import OrderedDict
+
+import pygame
+
+
+def surface_bytes(surface):
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+class RotationCache:
+    """Pre-rotated sprite frames at quantized angles, with LRU eviction
+
+    Each frame is stored with its half size, so drawing it centered on a
+    point needs no get_rect() call. Frames are rendered lazily on first use,
+    or all at once with preload(). Once max_bytes is exceeded the least
+    recently used frames are dropped.
+    """
+
+    def __init__(self, steps=120, max_bytes=32 * 1024 * 1024):
+        self.steps = steps
+        self.step_angle = 360 / steps
+        self.max_bytes = max_bytes
+
+        # (sprite, step) -> (rotated surface, half width, half height)
+        self._frames = OrderedDict()
+        self.total_bytes = 0
+        self._sprite_bytes = {}  # sprite -> bytes of its cached frames
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _render(self, sprite, step):
+        rotated = pygame.transform.rotate(sprite, step * self.step_angle)
+        frame = (rotated, rotated.get_width() // 2, rotated.get_height() // 2)
+        self._frames[(sprite, step)] = frame
+        self._count(sprite, surface_bytes(rotated))
+        while self.total_bytes > self.max_bytes and len(self._frames) > 1:
+            (evicted_sprite, _), (evicted, _, _) = self._frames.popitem(last=False)
+            self._count(evicted_sprite, -surface_bytes(evicted))
+            self.evictions += 1
+        return frame
+
+    def _count(self, sprite, size):
+        self.total_bytes += size
+        remaining = self._sprite_bytes.get(sprite, 0) + size
+        if remaining > 0:
+            self._sprite_bytes[sprite] = remaining
+        else:
+            self._sprite_bytes.pop(sprite, None)
+
+    def get(self, sprite, angle):
+        """Return (rotated surface, half width, half height) for the nearest cached angle"""
+        step = int(round(angle / self.step_angle)) % self.steps
+        frame = self._frames.get((sprite, step))
+        if frame is None:
+            self.misses += 1
+            return self._render(sprite, step)
+        self.hits += 1
+        self._frames.move_to_end((sprite, step))
+        return frame
+
+    def blit_centered(self, dest, sprite, angle, center):
+        """Draw sprite rotated by angle degrees, centered on center like get_rect(center=...)"""
+        rotated, half_width, half_height = self.get(sprite, angle)
+        dest.blit(rotated, (int(center[0]) - half_width, int(center[1]) - half_height))
+
+    def preload(self, sprite):
+        """Render every angle of sprite up front, e.g. while a level is starting"""
+        for step in range(self.steps):
+            if (sprite, step) not in self._frames:
+                self._render(sprite, step)
+
+    def discard(self, sprite):
+        """Drop every cached frame of sprite"""
+        for key in [key for key in self._frames if key[0] is sprite]:
+            rotated, _, _ = self._frames.pop(key)
+            self._count(sprite, -surface_bytes(rotated))
+
+    def sprite_bytes(self, sprite):
+        """Memory used by the cached frames of sprite"""
+        return self._sprite_bytes.get(sprite, 0)
+
+    def clear(self):
+        self._frames.clear()
+        self._sprite_bytes.clear()
+        self.total_bytes = 0
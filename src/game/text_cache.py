@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Text surface cache for Kill the VC
+Menus, the HUD and overlays redraw the same strings every frame, so rendered
+text surfaces are kept and reused instead of rasterizing the glyphs again
+"""
+
+from collections import OrderedDict
+
+
+class TextCache:
+    """LRU cache of rendered text keyed by (font, text, antialias, color)
+
+    render() takes the same arguments as pygame.font.Font.render, with the
+    font first. The returned surface is shared, so callers must not draw on it.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._surfaces = OrderedDict()
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def render(self, font, text, antialias, color, background=None):
+        """Return the cached surface for this text, rendering it on first use"""
+        key = (font, text, antialias, tuple(color), tuple(background) if background is not None else None)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color, background)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+            self.evictions += 1
+        return surface
+
+    def clear(self):
+        self._surfaces.clear()
+
+    def get_stats(self):
+        """Return a dict of cache counters"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._surfaces),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Shared hand tracking service for Kill the VC
+One camera and one MediaPipe model serve every game state that needs hand
+tracking. Both are warmed up in the background while the menu is shown, and
+the camera is paused, then released, when nothing is using it.
+"""
+
+import threading
+
+from capture import ThreadedCapture
+from frame_sources import open_frame_source
+from hand_tracking import HandTrackingWorker
+
+# Status values reported by TrackingService.status()
+STARTING = "starting"
+READY = "ready"
+UNAVAILABLE = "unavailable"
+
+
+class TrackingService:
+    """Owns the ThreadedCapture and HandTrackingWorker and their lifecycle
+
+    warm_up()       load the model and open the camera in the background
+    set_active()    called every frame with whether the current state needs tracking;
+                    inactive pauses the camera and releases it after idle_release_after seconds
+    latest()        newest TrackingResult, never blocks
+    shutdown()      stop everything when the game exits
+    """
+
+    def __init__(self, source=None, rate_controller=None, idle_release_after=30.0):
+        if source is None:
+            source = open_frame_source()
+        self.capture = ThreadedCapture(source)
+        self.tracker = HandTrackingWorker(self.capture, rate_controller=rate_controller)
+        self.idle_release_after = idle_release_after
+
+        self._lock = threading.Lock()
+        self._active = False
+        self._open_thread = None
+        self._release_timer = None
+        self._releasing = False  # The camera is being closed outside the lock
+
+    def warm_up(self):
+        """Start loading the model and opening the camera without blocking the caller"""
+        self.tracker.start()
+        self._open_camera_async()
+
+    def _open_camera_async(self):
+        with self._lock:
+            # While a release is in progress the releasing thread reopens the camera itself
+            if self._releasing or self.capture.is_running() or self._is_opening():
+                return
+            self._open_thread = threading.Thread(target=self._open_camera, name="camera-open", daemon=True)
+            self._open_thread.start()
+
+    def _is_opening(self):
+        return self._open_thread is not None and self._open_thread.is_alive()
+
+    def _open_camera(self):
+        # Opening a webcam can take a second or more, so it never happens on the main thread
+        if not self.capture.start():
+            return
+        with self._lock:
+            if not self._active:
+                self.capture.pause()
+                self._schedule_release()
+
+    def set_active(self, active):
+        """Resume tracking when a state needs it, pause it when none does"""
+        with self._lock:
+            if active == self._active:
+                return
+            self._active = active
+            self._cancel_release()
+            if active:
+                self.capture.resume()
+            else:
+                self.capture.pause()
+                self._schedule_release()
+
+        if active:
+            self.tracker.start()
+            self._open_camera_async()
+
+    def _schedule_release(self):
+        self._release_timer = threading.Timer(self.idle_release_after, self._release_camera)
+        self._release_timer.daemon = True
+        self._release_timer.start()
+
+    def _cancel_release(self):
+        if self._release_timer is not None:
+            self._release_timer.cancel()
+            self._release_timer = None
+
+    def _release_camera(self):
+        """Close the camera after it has been idle for a while; the model stays loaded"""
+        with self._lock:
+            if self._active or self._is_opening():
+                return
+            self._release_timer = None
+            self._releasing = True
+        self.capture.release()
+
+        # If tracking was wanted again while the camera closed, open it again now
+        with self._lock:
+            self._releasing = False
+            reopen = self._active
+        if reopen:
+            self._open_camera_async()
+
+    def latest(self):
+        """Return the most recent TrackingResult without waiting, or None"""
+        return self.tracker.latest()
+
+    @property
+    def failed(self):
+        """True once the camera could not be opened or stopped delivering frames"""
+        return self.capture.failed and not self._is_opening()
+
+    def status(self):
+        """STARTING, READY or UNAVAILABLE, for showing camera state to the player"""
+        if self.failed:
+            return UNAVAILABLE
+        if self.capture.is_running() and self.tracker.model_ready.is_set():
+            return READY
+        return STARTING
+
+    def shutdown(self):
+        """Stop tracking and release the camera"""
+        with self._lock:
+            self._active = False
+            self._cancel_release()
+        if self._open_thread is not None:
+            self._open_thread.join(timeout=5.0)
+        self.tracker.stop()
+        self.capture.release()
@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""
+Per-user cache directory for Kill the VC
+Probe results and preprocessed assets live here so later launches can skip
+the work. Everything in it can be deleted safely.
+"""
+
+import os
+
+# Bump when the layout of anything stored in the cache changes
+CACHE_VERSION = 1
+
+
+def get_cache_dir(*parts):
+    """Return (and create) a directory inside the versioned user cache"""
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    path = os.path.join(base, "KillTheVC", f"v{CACHE_VERSION}", *parts)
+    os.makedirs(path, exist_ok=True)
+    return path